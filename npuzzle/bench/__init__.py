@@ -0,0 +1,6 @@
+# 基准测试包：在 npuzzle/ 目录下运行 python -m bench（见 __main__.py）。
+import os, sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
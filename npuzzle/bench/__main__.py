@@ -0,0 +1,53 @@
+# python -m bench [--quick] [--save] [--threshold 0.3] [--only 子串]
+#   --save       把本次结果写成新的基线 bench/baselines/baseline.json
+#   默认与基线比较，任何用例 ops/sec 下降超过阈值则退出码为 1。
+# 基线是绝对计时：比较前按 calibrate 用例的快慢比例整体缩放，抵消机器差异；
+# 但各用例对 CPU / 缓存 / Python 版本的敏感度不同，换机器或换 Python 后先在本机 --save 一次。
+# 共享机器上单次结果仍有噪声（save_lb 等 fsync 用例尤甚），报回退后再跑一次确认。
+import argparse, json, os, platform, sys
+
+from . import SRC_DIR  # noqa: F401  （把 src/ 加入 sys.path）
+from .cases import CALIBRATION, build_cases
+from .harness import compare, measure, speed_ratio
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m bench", description="n-Puzzle benchmarks",
+                                 epilog="Baselines are machine-specific: after changing machine or "
+                                        "Python version, run once with --save on the unchanged tree.")
+    ap.add_argument("--quick", action="store_true", help="smaller corpora, fewer repeats")
+    ap.add_argument("--save", action="store_true", help="write results as the new baseline")
+    ap.add_argument("--baseline", default=os.path.join(BASELINE_DIR, "baseline.json"))
+    ap.add_argument("--threshold", type=float, default=0.3, help="allowed ops/sec drop (fraction)")
+    ap.add_argument("--only", default="", help="run cases whose name contains this text")
+    args = ap.parse_args(argv)
+
+    results = {}
+    for name, (fn, inputs, repeat, setup) in build_cases(args.quick).items():
+        if args.only not in name and name != CALIBRATION:
+            continue
+        r = results[name] = measure(fn, inputs, repeat, setup)
+        print(f"{name:45s} {r['ops_per_sec']:12.1f} ops/s  p50 {r['p50_us']:10.1f}us  "
+              f"p99 {r['p99_us']:10.1f}us  peak {r['peak_kb']:9.1f}KB")
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "results": results}, f, indent=2)
+        print(f"baseline saved to {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        print(f"machine speed vs baseline: x{speed_ratio(results, baseline, CALIBRATION):.2f}")
+        bad = compare(results, baseline, args.threshold, CALIBRATION)
+        for line in bad:
+            print("REGRESSION", line)
+        return 1 if bad else 0
+    print("no baseline found; run with --save to create one")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+# 5x5 Hint 微基准：增量评分 vs 整盘重算（旧实现）
+# 运行：python bench/bench_hint_kxk.py
+import os, sys, time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from core_scramble import scramble_from_goal
+from hint.hint_kxk import (next_state_after_one_segment, _neighbors_segment, _eval_state,
+                           _locked_mask, _goal_of, _rc)
+
+def full_rescan_hint(state_list, n):
+    """旧实现：每个邻居整盘 _eval_state，第二层逐个 _locked_mask。"""
+    cur = tuple(state_list)
+    if cur == _goal_of(n):
+        return None
+    locked = _locked_mask(cur, n)
+    cur_score = _eval_state(cur, n, locked)
+    zr, zc = _rc(cur.index(0), n)
+    best_next, best_score, best_len = None, 10**9, 10**9
+    for nxt, idx, _ in _neighbors_segment(cur, n):
+        r, c = _rc(idx, n)
+        move_len = abs(zr - r) + abs(zc - c)
+        score = _eval_state(nxt, n, locked)
+        if score < best_score or (score == best_score and move_len < best_len):
+            best_next, best_score, best_len = nxt, score, move_len
+    if best_next is not None and best_score <= cur_score:
+        return best_next
+    best_first, best_two_score, best_two_len = None, 10**9, 10**9
+    for s1, idx1, _ in list(_neighbors_segment(cur, n)):
+        locked1 = _locked_mask(s1, n)
+        r1, c1 = _rc(idx1, n)
+        len1 = abs(zr - r1) + abs(zc - c1)
+        for s2, _, _ in _neighbors_segment(s1, n):
+            score2 = _eval_state(s2, n, locked1)
+            if score2 < best_two_score or (score2 == best_two_score and len1 < best_two_len):
+                best_first, best_two_score, best_two_len = s1, score2, len1
+    return best_first if best_first is not None else best_next
+
+def _time_per_call(fn, corpus, n, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for s in corpus:
+            fn(s, n)
+    return (time.perf_counter() - t0) / (repeat * len(corpus))
+
+def main(n=5, count=200, repeat=5):
+    corpus = [scramble_from_goal(n, 400, seed=i) for i in range(count)]
+    for s in corpus:
+        assert next_state_after_one_segment(s, n) == full_rescan_hint(s, n)
+    # 只保留会走到深度 2 分支的局面，单独计时
+    deep = []
+    for s in corpus + [scramble_from_goal(n, 6, seed=i) for i in range(count * 10)]:
+        cur = tuple(s)
+        if cur == _goal_of(n):
+            continue
+        L = _locked_mask(cur, n)
+        if min(_eval_state(x, n, L) for x, _, _ in _neighbors_segment(cur, n)) > _eval_state(cur, n, L):
+            deep.append(s)
+
+    for name, corp in (("all", corpus), ("depth-2", deep)):
+        if not corp:
+            continue
+        old = _time_per_call(full_rescan_hint, corp, n, repeat)
+        new = _time_per_call(next_state_after_one_segment, corp, n, repeat)
+        print(f"{n}x{n} {name:8s} states={len(corp):4d}  full-rescan {old*1e6:8.1f} us/hint  "
+              f"incremental {new*1e6:8.1f} us/hint  speedup x{old/new:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# 基准用例：固定 seed 的 3×3/4×4/5×5（及 15×15 大棋盘）语料 + 10 ~ 100k 条的合成排行榜；装有 NumPy 时加测批量模拟。
+import atexit, copy, os, random, shutil, tempfile
+from typing import Callable, Dict, List, Tuple
+
+import core_batch
+import io_leaderboard
+from core_board import Board
+from core_journal import replay
+from core_scramble import random_solvable, scramble_from_goal
+from core_packed import pack
+from hint.hint_3x3 import bfs_first_move_3x3
+from hint.hint_cache import HintCache
+from hint.hint_kxk import next_state_after_one_segment
+from hint.hint_reduce import reduce_first_move
+from io_leaderboard import load_lb, save_lb, submit_record
+from io_lb_sqlite import SqliteStore
+
+SEED = 9001
+CALIBRATION = "calibrate"     # 与本仓库代码无关的固定负载，compare 用它抵消机器快慢
+
+def corpus(N: int, count: int) -> List[List[int]]:
+    return [random_solvable(N, SEED * 100 + N * 10_000 + i) for i in range(count)]
+
+def synthetic_lb(records: int) -> Dict:
+    rnd = random.Random(SEED + records)
+    lb = io_leaderboard._empty_lb()
+    for key in ("3", "4", "5"):
+        lb[key]["records_time"] = [
+            {"user": f"user{rnd.randrange(1000)}", "time_ms": rnd.randrange(5_000, 600_000),
+             "steps": rnd.randrange(10, 400), "date": "2025-10-20 18:45:01"}
+            for _ in range(records)]
+    return lb
+
+def _board_clicks(N: int, count: int) -> List[Tuple[List[int], List[int]]]:
+    rnd = random.Random(SEED + N)
+    return [(s, [rnd.randrange(N*N) for _ in range(64)]) for s in corpus(N, count)]
+
+def _play(arg):
+    board, clicks = arg
+    for k in clicks:
+        board.segment_move_if_valid(k)
+
+def _journals(N: int, count: int) -> List[Tuple[List[int], bytes]]:
+    """每局 1000 步随机有效点击，作为重放语料。"""
+    out = []
+    for s, clicks in _board_clicks(N, count):
+        board = Board(N, s)
+        rnd = random.Random(SEED + len(out))
+        while board.steps < 1000:
+            board.segment_move_if_valid(rnd.randrange(N*N))
+        out.append((s, bytes(board.journal.moves)))
+    return out
+
+def _simulate(arg):
+    batch, rng = arg
+    for _ in range(100):
+        batch.random_segment_move(rng)
+
+def _calibrate(data: List[int]):
+    """纯解释器负载（字典插入 + 排序），只随机器 / Python 版本变化，不随代码变化。"""
+    index = {}
+    for i, v in enumerate(data):
+        index[v] = i
+    return sorted(index, key=index.__getitem__)
+
+# name -> (fn, inputs, repeat, setup)
+Case = Tuple[Callable, list, int, Callable | None]
+
+def build_cases(quick: bool = False) -> Dict[str, Case]:
+    k = 1 if quick else 3
+    cases: Dict[str, Case] = {}
+    data = list(range(5_000))
+    random.Random(SEED).shuffle(data)
+    cases[CALIBRATION] = (_calibrate, [data] * 20, k, None)
+    for N in (3, 4, 5):
+        cases[f"board.segment_move_if_valid[{N}x{N}]x64"] = (
+            _play, _board_clicks(N, 50), k, lambda x, N=N: (Board(N, x[0]), x[1]))
+        cases[f"journal.replay[{N}x{N}]x1000"] = (
+            lambda x, N=N: replay(x[0], N, x[1]), _journals(N, 20), k, None)
+        cases[f"scramble_from_goal[{N}x{N}]"] = (
+            lambda s, N=N: scramble_from_goal(N, 200, seed=s), list(range(50)), k, None)
+        cases[f"next_state_after_one_segment[{N}x{N}]"] = (
+            lambda s, N=N: next_state_after_one_segment(s, N), corpus(N, 50), k, None)
+        if N > 3:
+            cases[f"reduce_first_move[{N}x{N}]"] = (
+                lambda s, N=N: reduce_first_move(s, N), corpus(N, 50), k, None)
+    # 大棋盘：每次操作的代价不应随 N² 增长
+    cases["board.segment_move_if_valid[15x15]x64"] = (
+        _play, _board_clicks(15, 20), k, lambda x: (Board(15, x[0]), x[1]))
+    cases["reduce_first_move[15x15]"] = (lambda s: reduce_first_move(s, 15), corpus(15, 20), k, None)
+    if core_batch.available():
+        # 批量模拟：1000 局 × 100 步随机点击 = 每次 10 万步
+        for N in (4, 15):
+            cases[f"batch.random_segment_move[{N}x{N}]x100k"] = (
+                _simulate, list(range(5)), k,
+                lambda s, N=N: (core_batch.BoardBatch.random_solvable(1000, N, seed=s),
+                                core_batch.np.random.default_rng(s)))
+    cases["bfs_first_move_3x3"] = (bfs_first_move_3x3, corpus(3, 5 if quick else 10), 1, None)
+    hc = HintCache(path=None)
+    codes = [pack(s, 4) for s in corpus(4, 1000)]
+    for i, code in enumerate(codes):
+        hc.put(4, code, i % 16)
+    cases["hint_cache.get[hit]x1000"] = (lambda cs: [hc.get(4, c) for c in cs], [codes] * 20, k, None)
+
+    # 排行榜读写：文件放到临时目录，不碰真实 data/
+    tmp = tempfile.mkdtemp(prefix="npuzzle-bench-")
+    atexit.register(shutil.rmtree, tmp, ignore_errors=True)
+    io_leaderboard.DATA_DIR = tmp
+    io_leaderboard.PATH = os.path.join(tmp, "leaderboard.json")
+    for records in ((10, 1_000) if quick else (10, 1_000, 100_000)):
+        lb = synthetic_lb(records)
+        reps = 20 if records <= 1_000 else 2
+        cases[f"save_lb[{records}]"] = (save_lb, [lb] * reps, 1, None)
+        cases[f"load_lb[{records}]"] = (lambda _x, lb=lb: load_lb(), [None] * reps, 1,
+                                        lambda x, lb=lb: save_lb(lb))
+        cases[f"submit_record[{records}]"] = (
+            lambda lb: submit_record(lb, 3, "bench", 12_345, 42), [lb] * reps, 1, copy.deepcopy)
+
+        store = SqliteStore(os.path.join(tmp, f"lb_{records}.sqlite3"), io_leaderboard.PATH)
+        store.db.executemany("INSERT INTO runs(size, user, time_ms, steps, date) VALUES (?,?,?,?,?)",
+                             [(int(key), r["user"], r["time_ms"], r["steps"], r["date"])
+                              for key, v in lb.items() for r in v["records_time"]])
+        cases[f"sqlite.submit_record[{records}]"] = (
+            lambda _x, st=store: st.submit_record(3, "bench", 12_345, 42), [None] * 50, 1, None)
+        cases[f"sqlite.top10[{records}]"] = (lambda _x, st=store: st.top10(3), [None] * 50, 1, None)
+        cases[f"sqlite.best_time_ms_user[{records}]"] = (
+            lambda _x, st=store: st.best_time_ms_user(3, "user7"), [None] * 50, 1, None)
+    return cases
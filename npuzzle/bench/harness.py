@@ -0,0 +1,73 @@
+# 计时与内存测量：ops/sec、延迟分位数、tracemalloc 峰值。
+import gc, time, tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+def _percentile(sorted_vals: List[float], q: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    i = min(len(sorted_vals) - 1, max(0, int(round(q * (len(sorted_vals) - 1)))))
+    return sorted_vals[i]
+
+def measure(fn: Callable[[Any], Any], inputs: List[Any], repeat: int = 1,
+            setup: Optional[Callable[[Any], Any]] = None) -> Dict[str, float]:
+    """
+    对 inputs 中每个参数调用 fn，重复 repeat 轮。
+    setup(x) 若给出，则每次调用前先生成实参（不计时），用于会修改入参的函数。
+    ops/sec 取最快一轮（同 timeit 的做法，受其他进程干扰最小）；分位数用全部调用。
+    内存峰值单独跑一轮测量，避免 tracemalloc 拖慢计时。
+    """
+    lat: List[float] = []
+    best = 0.0
+    gc.collect()
+    for _ in range(repeat):
+        start = len(lat)
+        for x in inputs:
+            arg = setup(x) if setup else x
+            t0 = time.perf_counter_ns()
+            fn(arg)
+            lat.append(time.perf_counter_ns() - t0)
+        total = sum(lat[start:])
+        if total:
+            best = max(best, (len(lat) - start) / (total / 1e9))
+
+    args = [setup(x) if setup else x for x in inputs]
+    gc.collect()
+    tracemalloc.start()
+    for arg in args:
+        fn(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    lat.sort()
+    return {
+        "calls": len(lat),
+        "ops_per_sec": best,
+        "p50_us": _percentile(lat, 0.50) / 1e3,
+        "p90_us": _percentile(lat, 0.90) / 1e3,
+        "p99_us": _percentile(lat, 0.99) / 1e3,
+        "peak_kb": peak / 1024,
+    }
+
+def speed_ratio(current: Dict[str, dict], baseline: Dict[str, dict], calibration: Optional[str]) -> float:
+    """本机相对基线机器的快慢（校准用例 ops/sec 之比）；任一方缺校准用例时为 1。"""
+    cur, base = current.get(calibration or ""), baseline.get(calibration or "")
+    if not cur or not base or base["ops_per_sec"] <= 0:
+        return 1.0
+    return cur["ops_per_sec"] / base["ops_per_sec"]
+
+def compare(current: Dict[str, dict], baseline: Dict[str, dict], threshold: float,
+            calibration: Optional[str] = None) -> List[str]:
+    """
+    ops/sec 比基线下降超过 threshold（比例）的用例名单。
+    给出 calibration 时，基线先按校准用例的快慢比例缩放，比较的是相对速度而不是绝对计时。
+    """
+    scale = speed_ratio(current, baseline, calibration)
+    bad = []
+    for name, res in current.items():
+        base = baseline.get(name)
+        if name == calibration or not base or base["ops_per_sec"] <= 0:
+            continue
+        expected = base["ops_per_sec"] * scale
+        if res["ops_per_sec"] < expected * (1 - threshold):
+            bad.append(f"{name}: {res['ops_per_sec']:.1f} ops/s vs baseline {expected:.1f} (scaled x{scale:.2f})")
+    return bad
@@ -4,6 +4,7 @@ from ui_home import HomeView
 from ui_leaderboard import LeaderboardView
 from ui_game import GameView
 from ui_success import SuccessView
+from ui_scheduler import Scheduler
 
 class App(tk.Tk):
     def __init__(self):
@@ -14,12 +15,14 @@ class App(tk.Tk):
 
         self.user: str | None = None
         self._frame = None
+        self.scheduler = Scheduler(self)   # 各页面的定时任务，切换页面时统一取消
 
         # 启动先显示登录页（不再弹窗）
         self.show_login()
 
     def _switch(self, widget):
         if self._frame:
+            self.scheduler.cancel(self._frame)
             self._frame.destroy()
         self._frame = widget
         self._frame.pack(fill="both", expand=True)
@@ -45,7 +48,8 @@ class App(tk.Tk):
         self._switch(GameView(
             self, self.user or "player", size,
             on_back_home=self.show_home,
-            on_success=self.show_success
+            on_success=self.show_success,
+            scheduler=self.scheduler
         ))
 
     def show_leaderboard(self):
@@ -0,0 +1,97 @@
+# 命令行批量求解：每行读入一个局面（JSON），并行求解，按完成顺序每行输出一个 JSON 结果。
+#
+#   python cli_solve.py puzzles.jsonl > results.jsonl
+#   python core_rated.py 4 30 40 --count 50 | python cli_solve.py -
+#
+# 输入行可以是 [1,2,...,0] 或 {"id": ..., "n": 4, "state": [...]}（n 可省略）。
+import argparse, json, math, os, sys, time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import List, Optional, Tuple
+from core_scramble import is_solvable
+
+def solve(state: List[int], N: int, max_nodes: int,
+          time_limit: float) -> Tuple[Optional[List[int]], int, bool, str]:
+    """
+    返回 (点击序列, 扩展节点数, 是否最优, 方法)；解不出时序列为 None。
+    方法：table（查 3×3 距离表，不扩展节点）/ bfs / ida / reduce（分阶段降维，非最优）。
+    """
+    if N == 3:
+        from hint.hint_3x3 import table_solve_3x3, bfs_solve_3x3
+        moves = table_solve_3x3(state)
+        if moves is not None:
+            return moves, 0, True, "table"
+        moves, nodes = bfs_solve_3x3(state)
+        return moves, nodes, moves is not None, "bfs"
+
+    from hint.hint_ida import ida_star
+    from hint.hint_reduce import reduce_solve
+    from hint.hint_worker import use_ida
+    if not use_ida(N):          # 没有模式库（大棋盘或未构建），IDA* 只会白白耗尽预算
+        return reduce_solve(state, N), 0, False, "reduce"
+    res = ida_star(state, N, max_nodes=max_nodes, time_limit=time_limit)
+    if res.moves is not None:
+        return res.moves, res.nodes, True, "ida"
+    # 超出预算：分阶段降维求解，得到一个（非最优）解；nodes 仍是 IDA* 白白扩展的节点数
+    moves = reduce_solve(state, N)
+    return moves, res.nodes, False, "reduce"
+
+def _job(key, state: List[int], N: int, max_nodes: int, time_limit: float) -> dict:
+    t0 = time.perf_counter()
+    try:
+        if not is_solvable(state, N):
+            raise ValueError("invalid or unsolvable board")
+        moves, nodes, optimal, method = solve(state, N, max_nodes, time_limit)
+        out = {"id": key, "n": N, "length": None if moves is None else len(moves), "moves": moves,
+               "nodes": nodes, "optimal": optimal, "method": method}
+        if moves is None:
+            out["error"] = "unsolved within budget"
+    except Exception as e:   # 单个局面出错不影响整批
+        out = {"id": key, "n": N, "error": f"{type(e).__name__}: {e}"}
+    out["wall_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+    return out
+
+def _parse(line: str, lineno: int):
+    obj = json.loads(line)
+    if isinstance(obj, list):
+        obj = {"state": obj}
+    state = [int(v) for v in obj["state"]]
+    N = int(obj.get("n") or math.isqrt(len(state)))
+    return obj.get("id", lineno), state, N
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Solve n-Puzzle states (segment-slide moves) in batch.")
+    ap.add_argument("input", nargs="?", default="-", help="JSON-lines file, or - for stdin")
+    ap.add_argument("--workers", type=int, default=None, help="process count (default: all cores)")
+    ap.add_argument("--max-nodes", type=int, default=2_000_000, help="IDA* node budget per puzzle")
+    ap.add_argument("--time-limit", type=float, default=30.0, help="IDA* seconds per puzzle")
+    args = ap.parse_args(argv)
+
+    src = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    limit = 2 * (args.workers or os.cpu_count() or 1)   # 在途任务上限：内存与输入大小无关
+    inflight = set()
+
+    def _drain(block_until_one: bool):
+        nonlocal inflight
+        done, inflight = wait(inflight, return_when=FIRST_COMPLETED) if block_until_one else (set(), inflight)
+        for fut in done:
+            sys.stdout.write(json.dumps(fut.result()) + "\n")
+        sys.stdout.flush()
+
+    with src, ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for lineno, line in enumerate(src, start=1):
+            if not line.strip():
+                continue
+            try:
+                key, state, N = _parse(line, lineno)
+            except (ValueError, KeyError, TypeError) as e:
+                sys.stdout.write(json.dumps({"id": lineno, "error": f"bad input: {e}"}) + "\n")
+                sys.stdout.flush()
+                continue
+            while len(inflight) >= limit:
+                _drain(True)
+            inflight.add(pool.submit(_job, key, state, N, args.max_nodes, args.time_limit))
+        while inflight:
+            _drain(True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+# 批量盘面运算（NumPy）：B 个盘面存成 (B, N*N) 的 uint8 数组，一次向量化操作推进所有盘面一步。
+# 段滑动 = 按「(空格, 被点格) -> 置换下标」查表后做一次 gather；相邻移动 = 每局交换两格。
+# 用于成绩核对（replay_batch）与大规模模拟（BoardBatch：随机对局基线、Hint 策略评估、打乱统计）。
+# NumPy 是可选依赖：没有安装时 available() 为 False，调用方退回逐局的 core_journal.replay / core_board.Board。
+from typing import Dict, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# _GATHER[n] = (perm, valid)：
+#   perm[b, k]  —— 空格在 b 时点击 k 后的新盘面 = 旧盘面[perm[b, k]]；k == n*n 表示「不动」
+#   valid[b, k] —— 该点击是否合法（与空格同行 / 同列且不是空格本身；k == n*n 视为合法，调用方另行排除越界点击）
+_GATHER: Dict[int, Tuple["np.ndarray", "np.ndarray"]] = {}
+_ADJ: Dict[int, "np.ndarray"] = {}      # adjacent_table
+_LINES: Dict[int, "np.ndarray"] = {}    # line_cells
+_DIST: Dict[int, "np.ndarray"] = {}     # dist_table
+
+def available() -> bool:
+    return np is not None
+
+def _require():
+    if np is None:
+        raise RuntimeError("NumPy is required for batch operations (pip install numpy)")
+
+def gather_tables(n: int) -> Tuple["np.ndarray", "np.ndarray"]:
+    _require()
+    tabs = _GATHER.get(n)
+    if tabs is not None:
+        return tabs
+    cells = n * n
+    # 下标都 < cells <= 225，存 uint8：15×15 约 11MB（intp 要 90MB）；gather 速度实测相同
+    perm = np.tile(np.arange(cells, dtype=np.uint8), (cells, cells + 1, 1))
+    valid = np.zeros((cells, cells + 1), dtype=bool)
+    valid[:, cells] = True
+    for b in range(cells):
+        br, bc = divmod(b, n)
+        for k in range(cells):
+            r, c = divmod(k, n)
+            if k == b or (r != br and c != bc):
+                continue
+            valid[b, k] = True
+            step = 1 if r == br else n
+            d = step if k < b else -step        # 块的移动方向
+            p = perm[b, k]
+            for i in range(b, k, -d):            # 格 i 取自格 i-d，被点格变成空格
+                p[i] = i - d
+            p[k] = b
+    tabs = _GATHER[n] = (perm, valid)
+    return tabs
+
+def pad_moves(seqs, n: int) -> "np.ndarray":
+    """不等长的点击序列补齐成 (B, L) 矩阵，空位填 -1（不动；日志里的任何字节都不会是 -1）。"""
+    _require()
+    L = max((len(m) for m in seqs), default=0)
+    out = np.full((len(seqs), L), -1, dtype=np.intp)
+    for i, m in enumerate(seqs):
+        out[i, :len(m)] = np.frombuffer(bytes(m), dtype=np.uint8)
+    return out
+
+def replay_batch(states: "np.ndarray", moves: "np.ndarray", n: int) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    states：(B, n*n) 开局；moves：(B, L) 点击下标（-1 为补齐，只出现在行尾）。
+    返回 (最终盘面, ok)；ok[i] 为 False 表示第 i 局出现过无效点击（之后该局按「不动」处理）。
+    越界的下标（>= n*n，日志被篡改时会出现）同样算无效点击，与逐局的 core_journal.replay 结论一致。
+    按序列长度降序处理，第 t 步只推进长度 > t 的那些局，补齐部分不做无用功。
+    """
+    _require()
+    perm, valid = gather_tables(n)
+    cells = n * n
+    lengths = (moves >= 0).sum(axis=1)
+    order = np.argsort(-lengths, kind="stable")
+    s = np.array(states, dtype=np.uint8)[order]
+    mv = moves[order]
+    active = np.searchsorted(-lengths[order], -np.arange(mv.shape[1]), side="left")
+    blank = np.argmin(s, axis=1)          # 0 即空格
+    ok = np.ones(len(s), dtype=bool)
+    for t in range(mv.shape[1]):
+        a = active[t]                     # 前 a 局在第 t 步还有点击
+        b = blank[:a]
+        k = mv[:a, t]
+        good = valid[b, np.minimum(k, cells)] & (k < cells)   # 第 cells 列是「不动」，越界点击不能落到它上面
+        ok[:a] &= good
+        k = np.where(good, k, b)          # 无效点击：不动（perm[b, b] 为恒等）
+        s[:a] = np.take_along_axis(s[:a], perm[b, k], axis=1)
+        blank[:a] = k
+    out = np.empty_like(s)
+    out[order] = s
+    ok_out = np.empty_like(ok)
+    ok_out[order] = ok
+    return out, ok_out
+
+def goal_mask(states: "np.ndarray", n: int) -> "np.ndarray":
+    _require()
+    return (states == _goal(n)).all(axis=1)
+
+# ----------------- 批量盘面引擎 -----------------
+
+def adjacent_table(n: int) -> "np.ndarray":
+    """(n*n, 4)：空格在 b 时向 上/下/左/右（与 core_packed.adjacent_cells 同序）走一格后的位置，出界为 -1。"""
+    _require()
+    tab = _ADJ.get(n)
+    if tab is None:
+        tab = np.full((n * n, 4), -1, dtype=np.intp)
+        for b in range(n * n):
+            r, c = divmod(b, n)
+            for d, (dr, dc) in enumerate(((-1, 0), (1, 0), (0, -1), (0, 1))):
+                if 0 <= r + dr < n and 0 <= c + dc < n:
+                    tab[b, d] = (r + dr) * n + c + dc
+        _ADJ[n] = tab
+    return tab
+
+def line_cells(n: int) -> "np.ndarray":
+    """(n*n, 2(n-1))：空格在 b 时所有可点击的格子（同行在前、同列在后）。"""
+    _require()
+    tab = _LINES.get(n)
+    if tab is None:
+        tab = np.empty((n * n, 2 * (n - 1)), dtype=np.intp)
+        for b in range(n * n):
+            r, c = divmod(b, n)
+            tab[b] = [r * n + j for j in range(n) if j != c] + [i * n + c for i in range(n) if i != r]
+        _LINES[n] = tab
+    return tab
+
+def dist_table(n: int) -> "np.ndarray":
+    """(n*n, n*n) uint8：dist[v, i] = 块 v 在格 i 时到目标格的曼哈顿距离（v = 0 为空格，恒为 0）。"""
+    _require()
+    tab = _DIST.get(n)
+    if tab is None:
+        v = np.arange(n * n)[:, None]
+        i = np.arange(n * n)[None, :]
+        g = np.where(v > 0, v - 1, i)
+        tab = (np.abs(i // n - g // n) + np.abs(i % n - g % n)).astype(np.uint8)
+        _DIST[n] = tab
+    return tab
+
+class BoardBatch:
+    """
+    B 个 n×n 盘面：states (B, n*n) uint8，blank (B,) 空格位置（随走子更新，不再整盘查找）。
+    走子方法对整批一次执行，返回 (B,) 布尔数组：该局这一步是否有效（无效的局保持不动，steps 不增加）。
+    规则与 core_board.Board 相同：segment_move(k) 对应 segment_move_if_valid(k)。
+    """
+    def __init__(self, states, n: int):
+        _require()
+        self.n = n
+        self.states = np.array(states, dtype=np.uint8).reshape(-1, n * n)
+        self.blank = np.argmin(self.states, axis=1).astype(np.intp)
+        self.steps = np.zeros(len(self.states), dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    # ---------------- 生成 ----------------
+    @classmethod
+    def goal(cls, count: int, n: int) -> "BoardBatch":
+        _require()
+        return cls(np.tile(_goal(n), (count, 1)), n)
+
+    @classmethod
+    def random_solvable(cls, count: int, n: int, seed: Optional[int] = None) -> "BoardBatch":
+        """
+        均匀随机的可解局面（不含目标本身），与 core_scramble.random_solvable 同分布：
+        逐行 Fisher–Yates 洗牌并记下交换次数的奇偶；不可解的行交换空格以外的前两块。
+        """
+        _require()
+        rng = np.random.default_rng(seed)
+        cells = n * n
+        s = np.tile(_goal(n), (count, 1))
+        rows = np.arange(count)
+        parity = np.zeros(count, dtype=bool)
+        for i in range(cells - 1, 0, -1):
+            j = rng.integers(0, i + 1, size=count)
+            s[rows, i], s[rows, j] = s[rows, j], s[rows, i].copy()
+            parity ^= j != i
+        b = np.argmin(s, axis=1)
+        need = (b // n + b % n) % 2 == 1     # 空格到右下角的距离奇偶（2(n-1) 为偶数）
+        bad = parity != need
+        first = np.where(b[bad] == 0, 1, 0)   # 前 3 格里空格以外的前两格
+        second = np.where(b[bad] <= 1, 2, 1)
+        r = rows[bad]
+        s[r, first], s[r, second] = s[r, second], s[r, first].copy()
+        batch = cls(s, n)
+        again = batch.is_goal()
+        if again.any():                       # 极少见：抽到目标本身则重抽这几行
+            batch.states[again] = cls.random_solvable(int(again.sum()), n, rng.integers(1 << 63)).states
+            batch.blank = np.argmin(batch.states, axis=1).astype(np.intp)
+        return batch
+
+    @classmethod
+    def scrambled(cls, count: int, n: int, steps: int = 200, seed: Optional[int] = None) -> "BoardBatch":
+        """从目标出发各走 steps 步随机相邻移动（不立即走回头路），与 core_scramble.scramble_from_goal 同分布。"""
+        batch = cls.goal(count, n)
+        rng = np.random.default_rng(seed)
+        adj = adjacent_table(n)
+        last = np.full(count, -1, dtype=np.intp)
+        for _ in range(steps):
+            nb = adj[batch.blank]                                  # (B, 4)
+            pick = np.where((nb >= 0) & (nb != last[:, None]), rng.random(nb.shape), -1.0)
+            prev = batch.blank.copy()
+            batch.adjacent_move(np.argmax(pick, axis=1))
+            last = prev
+        batch.steps[:] = 0
+        return batch
+
+    # ---------------- 走子 ----------------
+    def segment_move(self, k) -> "np.ndarray":
+        """每局点击 k[i]（标量则所有局点同一格）：与空格同行 / 同列时整段朝空格滑一格。"""
+        perm, valid = gather_tables(self.n)
+        cells = self.n * self.n
+        b = self.blank
+        k = np.broadcast_to(np.asarray(k, dtype=np.intp), b.shape)
+        ok = (k >= 0) & (k < cells)
+        ok[ok] = valid[b[ok], k[ok]]
+        k = np.where(ok, k, b)                 # 无效点击：不动（perm[b, b] 为恒等）
+        self.states = np.take_along_axis(self.states, perm[b, k], axis=1)
+        self.blank = k
+        self.steps += ok
+        return ok
+
+    def adjacent_move(self, d) -> "np.ndarray":
+        """空格向方向 d（0 上 1 下 2 左 3 右；标量或 (B,)）走一格；出界的局不动。"""
+        nb = adjacent_table(self.n)[self.blank, np.asarray(d, dtype=np.intp)]
+        ok = nb >= 0
+        rows = np.flatnonzero(ok)
+        b, t = self.blank[rows], nb[rows]
+        self.states[rows, b] = self.states[rows, t]
+        self.states[rows, t] = 0
+        self.blank[rows] = t
+        self.steps += ok
+        return ok
+
+    def random_segment_move(self, rng: "np.random.Generator") -> "np.ndarray":
+        """随机对局：每局在空格所在行 / 列的 2(n-1) 个格子里均匀选一个点击（总是有效）；返回点击下标。"""
+        lines = line_cells(self.n)
+        k = lines[self.blank, rng.integers(0, lines.shape[1], size=len(self))]
+        self.segment_move(k)
+        return k
+
+    # ---------------- 统计 ----------------
+    def is_goal(self) -> "np.ndarray":
+        return goal_mask(self.states, self.n)
+
+    def manhattan(self) -> "np.ndarray":
+        """各局所有块到目标格的曼哈顿距离之和，(B,) int32。"""
+        cells = self.n * self.n
+        return dist_table(self.n)[self.states, np.arange(cells)].sum(axis=1, dtype=np.int32)
+
+def _goal(n: int) -> "np.ndarray":
+    return np.append(np.arange(1, n * n, dtype=np.uint8), np.uint8(0))
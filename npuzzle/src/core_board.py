@@ -1,56 +1,121 @@
-from typing import List, Tuple
+from array import array
+from typing import Dict, Optional, Sequence
+from core_scramble import is_solvable
+from core_journal import MoveJournal
+
+# 支持的棋盘尺寸：3~5 为常规关卡，6~15 为大棋盘（训练用）
+MIN_SIZE, MAX_SIZE = 3, 15
+SIZES = tuple(range(MIN_SIZE, MAX_SIZE + 1))
+LARGE_SIZES = tuple(n for n in SIZES if n > 5)
+
+# _DIST[N][v*N*N + i]：块 v 在格子 i 时到其目标格的曼哈顿距离（v = 0 为空格，恒为 0）
+_DIST: Dict[int, bytes] = {}
+
+def _dist_table(N: int) -> bytes:
+    tab = _DIST.get(N)
+    if tab is None:
+        NN = N * N
+        out = bytearray(NN * NN)
+        for v in range(1, NN):
+            gr, gc = divmod(v - 1, N)
+            for i in range(NN):
+                r, c = divmod(i, N)
+                out[v*NN + i] = abs(r - gr) + abs(c - gc)
+        tab = _DIST[N] = bytes(out)
+    return tab
 
 class Board:
-    """State + segment-slide moves (row/column slide toward blank)."""
-    def __init__(self, N: int, initial: List[int]):
+    """
+    State + segment-slide moves (row/column slide toward blank).
+    - state: array('B')；blank 为缓存的空格位置；manhattan 随走子增量维护（为 0 即已还原）；
+    - 每次走子返回被改动的格子 range（段 + 原空格），渲染 / 启发式可据此增量更新，无效点击返回 None；
+    - undo / redo：撤销即点回上一步的空格位置，只动一段，与棋盘大小无关。
+    """
+    __slots__ = ("N", "goal", "start", "state", "blank", "steps", "journal", "manhattan", "_dist", "_redo")
+
+    def __init__(self, N: int, initial: Sequence[int]):
+        if not is_solvable(initial, N):
+            raise ValueError(f"invalid or unsolvable {N}x{N} board: {list(initial)}")
         self.N = N
-        self.goal = list(range(1, N*N)) + [0]
-        self.start = initial[:]
-        self.state = initial[:]
+        self.goal = array("B", list(range(1, N*N)) + [0])
+        self.start = array("B", initial)
+        self._dist = _dist_table(N)
+        self._redo = bytearray()         # 被撤销的点击（栈顶为最近撤销的那一步）
+        self.journal = MoveJournal()     # 每步点击下标 + 时刻，可重放整局
         self.steps = 0
+        self.set_state(initial)
 
     def is_goal(self) -> bool:
-        return self.state == self.goal
+        return self.manhattan == 0
 
     def reset_to_start(self):
-        self.state = self.start[:]
+        self.set_state(self.start)
         self.steps = 0
+        self.journal.clear()
+
+    def set_state(self, state: Sequence[int]):
+        """整盘替换（重置、管理员还原等）：同步空格位置与曼哈顿距离，清空重做栈。"""
+        self.state = array("B", state)
+        self.blank = self.state.index(0)
+        NN, D = self.N * self.N, self._dist
+        self.manhattan = sum(D[v*NN + i] for i, v in enumerate(self.state))
+        self._redo.clear()
 
     # --- segment-slide neighbors for a given click index ---
-    def segment_move_if_valid(self, tile_idx: int) -> bool:
-        """Click a tile; if blank in same row/col, slide the whole segment toward blank (one move)."""
-        N = self.N
-        s = self.state
-        b = s.index(0)
-        br, bc = divmod(b, N)
-        r, c = divmod(tile_idx, N)
-
-        if r == br:
-            if c < bc:  # blank right: shift [c..bc-1] -> right
-                for cc in range(bc, c, -1):
-                    s[br*N + cc] = s[br*N + (cc-1)]
-                s[br*N + c] = 0
-            elif c > bc:  # blank left: shift [bc+1..c] -> left
-                for cc in range(bc, c):
-                    s[br*N + cc] = s[br*N + (cc+1)]
-                s[br*N + c] = 0
-            else:
-                return False
-            self.steps += 1
-            return True
-
-        if c == bc:
-            if r < br:  # blank below: shift [r..br-1] -> down
-                for rr in range(br, r, -1):
-                    s[rr*N + bc] = s[(rr-1)*N + bc]
-                s[r*N + bc] = 0
-            elif r > br:  # blank above: shift [br+1..r] -> up
-                for rr in range(br, r):
-                    s[rr*N + bc] = s[(rr+1)*N + bc]
-                s[r*N + bc] = 0
-            else:
-                return False
-            self.steps += 1
-            return True
-
-        return False
+    def _shift(self, k: int) -> range:
+        """空格与 k 之间的段朝空格移动一格（调用方已确认同行 / 同列），返回改动的格子。"""
+        N, s, b, D = self.N, self.state, self.blank, self._dist
+        NN = N * N
+        step = 1 if k // N == b // N else N
+        if k < b:
+            s[k+step:b+step:step] = s[k:b:step]
+            changed, m = range(k, b + 1, step), step        # m：段内块的位移（下标增量）
+        else:
+            s[b:k:step] = s[b+step:k+step:step]
+            changed, m = range(b, k + 1, step), -step
+        s[k] = 0
+        delta = 0
+        for i in changed:
+            v = s[i]
+            if v:
+                delta += D[v*NN + i] - D[v*NN + i - m]
+        self.manhattan += delta
+        self.blank = k
+        return changed
+
+    def segment_move_if_valid(self, tile_idx: int, t_ms: int = 0) -> Optional[range]:
+        """Click a tile; if blank in same row/col, slide the whole segment toward blank (one move).
+        Returns the changed cells (a truthy range) or None for an invalid click.
+        Successful moves are appended to the journal with timestamp t_ms."""
+        N, b, k = self.N, self.blank, tile_idx
+        if k == b or not 0 <= k < N*N or (k // N != b // N and k % N != b % N):
+            return None
+        changed = self._shift(k)
+        self.steps += 1
+        self.journal.record(k, t_ms)
+        if self._redo:
+            self._redo.clear()
+        return changed
+
+    # --- undo / redo ---
+    def undo(self) -> Optional[range]:
+        """撤销上一步：点回上一步之前的空格位置，日志与步数同步回退。没有可撤销的返回 None。"""
+        moves = self.journal.moves
+        if not moves:
+            return None
+        prev = moves[-2] if len(moves) > 1 else self.start.index(0)
+        k, _t = self.journal.pop()
+        changed = self._shift(prev)
+        self.steps -= 1
+        self._redo.append(k)
+        return changed
+
+    def redo(self, t_ms: int = 0) -> Optional[range]:
+        """重做最近一次撤销的点击（记入日志，时刻为 t_ms）。"""
+        if not self._redo:
+            return None
+        k = self._redo.pop()
+        changed = self._shift(k)
+        self.steps += 1
+        self.journal.record(k, t_ms)
+        return changed
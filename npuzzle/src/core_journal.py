@@ -0,0 +1,148 @@
+# 走子日志：每次点击记 1 字节（被点格子的下标）+ 距上一步的毫秒差（LEB128 变长，通常 1~2 字节）。
+# 配合开局盘面即可完整重放一局：核对成绩、复现问题、撤销 / 重做。
+import base64, re
+from typing import Dict, List, Sequence, Tuple
+
+_VERSION = 1
+
+# _LINE[n][b*n*n + k]：空格在 b 时点击 k 的方向（1 横向，2 竖向，0 无效）
+_LINE: Dict[int, bytes] = {}
+
+def _line_table(n: int) -> bytes:
+    tab = _LINE.get(n)
+    if tab is None:
+        cells = n * n
+        out = bytearray(cells * cells)
+        for b in range(cells):
+            for k in range(cells):
+                if k != b:
+                    if k // n == b // n:
+                        out[b*cells + k] = 1
+                    elif k % n == b % n:
+                        out[b*cells + k] = 2
+        tab = _LINE[n] = bytes(out)
+    return tab
+
+class MoveJournal:
+    """moves：点击下标（bytearray，每步 1 字节）；times：每步时刻（毫秒，相对开局）。"""
+    def __init__(self):
+        self.moves = bytearray()
+        self.times: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    def record(self, idx: int, t_ms: int = 0):
+        self.moves.append(idx)
+        self.times.append(t_ms)
+
+    def clear(self):
+        self.moves.clear()
+        self.times.clear()
+
+    def pop(self) -> Tuple[int, int]:
+        return self.moves.pop(), self.times.pop()
+
+    def to_bytes(self) -> bytes:
+        out = bytearray([_VERSION])
+        prev = 0
+        for k, t in zip(self.moves, self.times):
+            out.append(k)
+            d = max(0, t - prev)
+            prev = t
+            while d >= 0x80:
+                out.append((d & 0x7F) | 0x80)
+                d >>= 7
+            out.append(d)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "MoveJournal":
+        if not blob or blob[0] != _VERSION:
+            raise ValueError("unknown journal format")
+        j = cls()
+        i, t, end = 1, 0, len(blob)
+        while i < end:
+            j.moves.append(blob[i])
+            d = shift = 0
+            while True:
+                i += 1
+                if i >= end:
+                    raise ValueError("truncated journal")
+                byte = blob[i]
+                d |= (byte & 0x7F) << shift
+                shift += 7
+                if byte < 0x80:
+                    break
+            i += 1
+            t += d
+            j.times.append(t)
+        return j
+
+    # 记录里用文本存（JSON 排行榜 / 历史日志）
+    def to_text(self) -> str:
+        return base64.b64encode(self.to_bytes()).decode("ascii")
+
+    @classmethod
+    def from_text(cls, text: str) -> "MoveJournal":
+        return cls.from_bytes(base64.b64decode(text))
+
+# 一条记录 = 下标字节 + 若干个高位为 1 的延续字节 + 一个高位为 0 的结束字节
+_RECORD = re.compile(rb"(.)[\x80-\xff]*[\x00-\x7f]", re.S)
+_RECORDS = re.compile(rb"(?:.[\x80-\xff]*[\x00-\x7f])*", re.S)
+
+_HIGH = bytes(range(0x80, 0x100))
+
+def journal_moves(blob: bytes, cells: int = 256) -> bytes:
+    """
+    只取点击下标（跳过时间），批量核对时用；全部在 C 层完成。
+    cells <= 128 时下标字节高位也是 0，去掉延续字节后「下标、结束字节」交替出现，隔一个取一个即可。
+    """
+    if not blob or blob[0] != _VERSION:
+        raise ValueError("unknown journal format")
+    if cells <= 0x80:
+        low = blob[1:].translate(None, _HIGH)
+        if len(low) % 2 or blob[-1] >= 0x80:
+            raise ValueError("truncated journal")
+        return low[0::2]
+    if not _RECORDS.fullmatch(blob, 1):
+        raise ValueError("truncated journal")
+    return b"".join(_RECORD.findall(blob, 1))
+
+def replay(start: Sequence[int], N: int, moves: Sequence[int]) -> List[int]:
+    """
+    按 Board.segment_move_if_valid 的规则依次点击，返回最终盘面。
+    段平移用切片赋值（C 层完成），每步与段长无关地只有几次 Python 操作。
+    遇到无效点击抛 ValueError（附带步号）。
+    """
+    s = list(start)
+    tab = _line_table(N)
+    cells = N * N
+    b = s.index(0)
+    for step, k in enumerate(moves):
+        kind = tab[b*cells + k] if k < cells else 0
+        if kind == 1:
+            if k < b:
+                s[k+1:b+1] = s[k:b]
+            else:
+                s[b:k] = s[b+1:k+1]
+        elif kind == 2:
+            if k < b:
+                s[k+N:b+N:N] = s[k:b:N]
+            else:
+                s[b:k:N] = s[b+N:k+N:N]
+        else:
+            raise ValueError(f"move {step}: cell {k} is not in line with blank {b}")
+        s[k] = 0
+        b = k
+    return s
+
+def verify_run(start: Sequence[int], N: int, journal: MoveJournal, steps: int) -> bool:
+    """日志能否从 start 走到目标，且步数与记录一致。"""
+    if len(journal) != steps:
+        return False
+    try:
+        final = replay(start, N, journal.moves)
+    except ValueError:
+        return False
+    return final == list(range(1, N*N)) + [0]
@@ -0,0 +1,76 @@
+# 压缩状态：整盘打包成一个 int（每格固定位宽），段滑动 = 掩码 + 移位。
+# 3×3/4×4 每格 4 位（4×4 正好 64 位），5×5 每格 5 位（125 位）。
+# 空格位置不在编码里单独存，由调用方随编码一起携带。
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+# _SLIDES[n][blank] = [(点击下标, 保留掩码, 移动掩码, 移位), ...]，移位 > 0 表示左移
+_SLIDES: Dict[int, List[List[Tuple[int, int, int, int]]]] = {}
+# _ADJ[n][blank] = [(相邻下标, 其位偏移), ...]（上、下、左、右）
+_ADJ: Dict[int, List[List[Tuple[int, int]]]] = {}
+
+def cell_bits(n: int) -> int:
+    return max(4, (n*n - 1).bit_length())
+
+def pack(state: Sequence[int], n: int) -> int:
+    bits = cell_bits(n)
+    code = 0
+    for i, v in enumerate(state):
+        code |= v << (i * bits)
+    return code
+
+def unpack(code: int, n: int) -> List[int]:
+    bits = cell_bits(n)
+    m = (1 << bits) - 1
+    return [(code >> (i * bits)) & m for i in range(n*n)]
+
+def _slides(n: int) -> List[List[Tuple[int, int, int, int]]]:
+    tab = _SLIDES.get(n)
+    if tab is not None:
+        return tab
+    bits = cell_bits(n)
+    cell = (1 << bits) - 1
+    full = (1 << (n*n*bits)) - 1
+    tab = []
+    for b in range(n*n):
+        br, bc = divmod(b, n)
+        opts = []
+        for k in list(range(br*n, (br+1)*n)) + list(range(bc, n*n, n)):
+            if k == b:
+                continue
+            step = 1 if k // n == br else n
+            seg = move = 0
+            for i in range(min(k, b), max(k, b) + 1, step):
+                seg |= cell << (i * bits)
+            # k < b：k..b-step 的块整体后移 step 格；k > b：b+step..k 前移
+            for i in (range(k, b, step) if k < b else range(b + step, k + 1, step)):
+                move |= cell << (i * bits)
+            shift = step * bits if k < b else -step * bits
+            opts.append((k, full ^ seg, move, shift))
+        tab.append(opts)
+    _SLIDES[n] = tab
+    return tab
+
+def slide(code: int, blank: int, k: int, n: int) -> int:
+    """点击 k（须与空格 blank 同行/列）后的编码；新空格位置即 k。"""
+    for kk, keep, move, shift in _slides(n)[blank]:
+        if kk == k:
+            return (code & keep) | ((code & move) << shift if shift > 0 else (code & move) >> -shift)
+    raise ValueError(f"cell {k} is not in line with blank {blank}")
+
+def neighbors_segment(code: int, blank: int, n: int) -> Iterator[Tuple[int, int]]:
+    """所有一次段滑动邻居：(新编码, 新空格位置 = 被点下标)。"""
+    for k, keep, move, shift in _slides(n)[blank]:
+        yield (code & keep) | ((code & move) << shift if shift > 0 else (code & move) >> -shift), k
+
+def adjacent_cells(n: int) -> List[List[Tuple[int, int]]]:
+    tab = _ADJ.get(n)
+    if tab is None:
+        bits = cell_bits(n)
+        tab = []
+        for b in range(n*n):
+            r, c = divmod(b, n)
+            tab.append([(nr*n + nc, (nr*n + nc) * bits)
+                        for nr, nc in ((r-1, c), (r+1, c), (r, c-1), (r, c+1))
+                        if 0 <= nr < n and 0 <= nc < n])
+        _ADJ[n] = tab
+    return tab
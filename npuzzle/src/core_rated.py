@@ -0,0 +1,136 @@
+# 按难度出题：3×3 精确最优步数 d，4×4 及以上给定步数区间 [lo, hi]。
+#
+# 批量生成（每行一个 JSON）：python core_rated.py 4 40 50 --count 200
+# 难度度量：
+# - 3×3：最优段滑动步数，查表即得；
+# - 4×4 及以上（默认）：分阶段降维解的步数，即 Hint 实际会带玩家走的步数。
+#   它是最优步数的上界，噪声较大（同样 10 步游走出的局面可在 7~75 之间），
+#   但每个候选只要几毫秒：实测 4×4 的 40~50 区间每 CPU 分钟上千个；
+# - --exact：IDA* 求最优步数，需要先构建该尺寸的模式库；即便有 4×4 模式库，
+#   16~18 步区间每 CPU 分钟也只有十几个，更远的局面基本解不出。
+import argparse, json, multiprocessing, os, random, sys
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Iterator, List, Optional, Tuple
+from core_packed import pack, unpack, neighbors_segment
+from hint.hint_3x3 import (load_distance_table_3x3, build_distance_table_3x3,
+                           ranks_at_distance_3x3, unrank_3x3)
+from hint.hint_ida import ida_available, ida_star
+from hint.hint_reduce import reduce_solve
+
+_ranks_cache: dict[int, List[int]] = {}
+_stop = None        # 工作进程里的共享停止标志（_init_worker 设置）
+
+def segment_walk(N: int, steps: int, rnd: random.Random) -> List[int]:
+    """从目标出发随机走 steps 次段滑动，横竖交替（同线连续两滑等价于一滑）。"""
+    code = pack(list(range(1, N*N)) + [0], N)
+    b = N*N - 1
+    last_h = None
+    for _ in range(steps):
+        opts = [(c, k) for c, k in neighbors_segment(code, b, N) if (k // N == b // N) is not last_h]
+        code, k = rnd.choice(opts)
+        last_h = k // N == b // N
+        b = k
+    return unpack(code, N)
+
+def puzzles_at_distance_3x3(d: int, count: int, seed: Optional[int] = None) -> List[Tuple[List[int], int]]:
+    """从距离表中「恰为 d」的状态里均匀抽 count 个（可重复）。无表时先生成一次。"""
+    if load_distance_table_3x3() is None:
+        build_distance_table_3x3()
+    ranks = _ranks_cache.get(d)
+    if ranks is None:
+        ranks = _ranks_cache[d] = ranks_at_distance_3x3(d)
+    if not ranks:
+        raise ValueError(f"no 3x3 state at segment distance {d}")
+    rnd = random.Random(seed)
+    return [(list(unrank_3x3(rnd.choice(ranks))), d) for _ in range(count)]
+
+def _init_worker(stop):
+    global _stop
+    _stop = stop
+
+def _rated_batch(N: int, lo: int, hi: int, seed: int, attempts: int, exact: bool,
+                 max_nodes: int, time_limit: float) -> List[Tuple[List[int], int]]:
+    """
+    进程池任务：随机游走 + 拒绝采样。
+    exact 时用 IDA*（以 hi 为上限剪枝）求最优步数，游走 lo~hi 步；
+    否则用降维解步数，游走 1~hi 步（降维解常比游走长，短游走也可能落在区间内）。
+    """
+    rnd = random.Random(seed)
+    hits = []
+    for _ in range(attempts):
+        if _stop is not None and _stop.is_set():
+            break
+        if exact:
+            s = segment_walk(N, rnd.randint(lo, hi), rnd)
+            moves = ida_star(s, N, max_nodes=max_nodes, time_limit=time_limit, max_cost=hi, cancel=_stop).moves
+        else:
+            s = segment_walk(N, rnd.randint(1, hi), rnd)
+            moves = reduce_solve(s, N, _stop)
+        if moves is not None and lo <= len(moves) <= hi:
+            hits.append((s, len(moves)))
+    return hits
+
+def generate_rated(N: int, lo: int, hi: int, count: int, seed: int = 0, workers: Optional[int] = None,
+                   exact: bool = False, attempts_per_task: Optional[int] = None,
+                   max_nodes: int = 2_000_000, time_limit: float = 10.0) -> Iterator[Tuple[List[int], int]]:
+    """
+    逐个产出 (state, 步数)，共 count 个，步数在 [lo, hi]。
+    - 3×3：直接查距离表得最优步数，不需要求解器；
+    - 更大尺寸：步数为降维解步数（非最优，见文件头）；exact=True 时为 IDA* 最优步数，
+      要求该尺寸的模式库已构建，否则抛 ValueError；
+    - 在进程池上并行拒绝采样，完成一批就流式产出，同时在途任务数有上限；
+      凑够 count 个（或调用方提前关闭生成器）时置位共享停止标志，正在跑的任务在下一次检查时就返回。
+    """
+    if N == 3:
+        rnd = random.Random(seed)
+        for _ in range(count):
+            d = rnd.randint(lo, hi)
+            yield puzzles_at_distance_3x3(d, 1, rnd.randrange(1 << 30))[0]
+        return
+    if exact and not ida_available(N):
+        raise ValueError(f"no {N}x{N} pattern database; build it with: python -m hint.hint_pdb {N}")
+    if attempts_per_task is None:
+        attempts_per_task = 8 if exact else 128     # 降维解每个候选只要几毫秒，任务要大一些
+
+    made = 0
+    task = 0
+    stop = multiprocessing.Event()
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(stop,))
+    try:
+        inflight = set()
+        limit = 2 * (workers or os.cpu_count() or 1)   # 在途任务上限，内存有界
+        while made < count:
+            while len(inflight) < limit:
+                inflight.add(pool.submit(_rated_batch, N, lo, hi, seed * 1_000_003 + task,
+                                         attempts_per_task, exact, max_nodes, time_limit))
+                task += 1
+            done, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                for item in fut.result():
+                    if made < count:
+                        made += 1
+                        yield item
+    finally:
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Generate n-Puzzle boards in a difficulty band "
+                                             "(3x3: optimal distance; larger: staged-solver length).")
+    ap.add_argument("n", type=int)
+    ap.add_argument("lo", type=int)
+    ap.add_argument("hi", type=int, nargs="?", help="defaults to lo (exact distance)")
+    ap.add_argument("--count", type=int, default=100)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--exact", action="store_true",
+                    help="rate 4x4/5x5 by optimal distance via IDA* (needs the pattern database; slow)")
+    args = ap.parse_args()
+    exact = args.n == 3 or args.exact
+    try:
+        for state, dist in generate_rated(args.n, args.lo, args.hi if args.hi is not None else args.lo,
+                                          args.count, args.seed, args.workers, exact=args.exact):
+            sys.stdout.write(json.dumps({"n": args.n, "state": state, "distance": dist, "optimal": exact}) + "\n")
+            sys.stdout.flush()
+    except ValueError as e:
+        sys.exit(f"error: {e}")
@@ -1,29 +1,67 @@
 import random
-from typing import List, Tuple
-
-def neighbors_adjacent(state: Tuple[int, ...], N: int, last_blank: int | None):
-    res = []
-    b = state.index(0)
-    r, c = divmod(b, N)
-    for dr, dc in ((-1,0),(1,0),(0,-1),(0,1)):
-        nr, nc = r+dr, c+dc
-        if 0 <= nr < N and 0 <= nc < N:
-            nb = nr*N + nc
-            if last_blank is not None and nb == last_blank:  # avoid immediate backtrack
-                continue
-            lst = list(state)
-            lst[b], lst[nb] = lst[nb], lst[b]
-            res.append((nb, tuple(lst)))
-    return res
+from typing import List
+from core_packed import pack, unpack, cell_bits, adjacent_cells
 
 def scramble_from_goal(N: int, steps: int = 200, seed: int | None = None) -> List[int]:
-    goal = tuple(list(range(1, N*N)) + [0])
+    # 在压缩编码上游走（邻居按上、下、左、右的顺序、不立即走回头路，同一 seed 结果不变）
+    s = pack(list(range(1, N*N)) + [0], N)
+    b = N*N - 1
+    bits = cell_bits(N)
+    cell = (1 << bits) - 1
+    adj = adjacent_cells(N)
     rnd = random.Random(seed)
-    s = goal
     last_blank = None
     for _ in range(steps):
-        opts = neighbors_adjacent(s, N, last_blank)
-        nb, nxt = rnd.choice(opts)
-        last_blank = s.index(0)
-        s = nxt
-    return list(s)
+        opts = [(nb, sh) for nb, sh in adj[b] if nb != last_blank]
+        nb, sh = rnd.choice(opts)
+        v = (s >> sh) & cell       # 只有被选中的那一步才真正生成新编码
+        s ^= (v << sh) ^ (v << (b * bits))
+        last_blank = b
+        b = nb
+    return unpack(s, N)
+
+def is_solvable(state, N: int) -> bool:
+    """
+    合法排列（恰好 0..N*N-1 各一次）且可还原到目标：
+    每步 = 一次对换 + 空格走一格，所以排列奇偶必须等于空格到右下角的曼哈顿距离的奇偶。
+    用置换环计数求奇偶，O(N²)。
+    """
+    NN = N*N
+    if len(state) != NN:
+        return False
+    goal_pos = [0] * NN          # 数值 v 的目标格；0 在最后一格
+    seen = bytearray(NN)
+    for v in state:
+        if not (0 <= v < NN) or seen[v]:
+            return False
+        seen[v] = 1
+        goal_pos[v] = v - 1 if v else NN - 1
+    seen = bytearray(NN)
+    cycles = 0
+    for i in range(NN):
+        if not seen[i]:
+            cycles += 1
+            j = i
+            while not seen[j]:
+                seen[j] = 1
+                j = goal_pos[state[j]]
+    b = list(state).index(0)
+    r, c = divmod(b, N)
+    return (NN - cycles) % 2 == (2*(N-1) - r - c) % 2
+
+def random_solvable(N: int, seed: int | None = None) -> List[int]:
+    """
+    均匀随机的可解局面（不含目标本身），O(N²)：
+    随机洗牌；若不可解，交换空格以外的前两块（空格位置不变，奇偶翻转），
+    该交换是「不可解 <-> 可解」之间的双射，所以结果仍是均匀分布。
+    """
+    rnd = random.Random(seed)
+    goal = list(range(1, N*N)) + [0]
+    while True:
+        s = goal[:]
+        rnd.shuffle(s)
+        if not is_solvable(s, N):
+            i, j = [k for k in range(3) if s[k]][:2]
+            s[i], s[j] = s[j], s[i]
+        if s != goal:
+            return s
@@ -8,6 +8,7 @@ class GameTimer:
     - stop(): 停止计时（保留累计时间）
     - elapsed(): 返回累计秒数（运行中 = now - t0；停止后 = 固定累计值）
     - fmt(): 将秒数转 MM:SS
+    - ms_to_next_second(): 供 UI 对齐到显示跳变时刻刷新
     说明：默认构造后不启动（用于预览态显示 00:00）。
     """
     def __init__(self):
@@ -37,6 +38,18 @@ class GameTimer:
             return time.perf_counter() - self._t0
         return self._elapsed
 
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def ms_to_next_second(self) -> int | None:
+        """距离 fmt() 显示值下一次变化的毫秒数；停止时返回 None（无需刷新）。"""
+        if not self._running:
+            return None
+        e = self.elapsed()
+        boundary = int(e + 0.5) + 0.5       # fmt 四舍五入，显示在 x.5 秒处跳变
+        return int((boundary - e) * 1000) + 1
+
     @staticmethod
     def fmt(seconds: float) -> str:
         s = int(seconds + 0.5)  # 四舍五入到最近整秒，显示更自然
@@ -1,10 +1,22 @@
 # 3x3 Smart Hint: shortest path under "segment-slide = 1 move".
+import mmap, os, struct
 from collections import deque
 from typing import Tuple, List, Optional
+from core_packed import pack, unpack, neighbors_segment
 
 N = 3
 GOAL = (1,2,3,4,5,6,7,8,0)
 
+# 距离表：按排列序号（Lehmer rank）存每个状态到 GOAL 的段滑动步数，1 字节/状态
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data")
+DIST_PATH = os.path.join(DATA_DIR, "hint_3x3_dist.bin")
+_MAGIC = b"NP3D"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHBB")   # magic, version, N, reserved
+_UNREACHED = 0xFF
+_STATES = 362880                    # 9!
+_FACT = (40320, 5040, 720, 120, 24, 6, 2, 1, 1)  # 8! .. 0!
+
 def neighbors_segment_3x3(s: Tuple[int, ...]) -> List[Tuple[int, ...]]:
     res = []
     s_list = list(s)
@@ -46,21 +58,175 @@ def bfs_first_move_3x3(start: List[int] | Tuple[int, ...]) -> Tuple[Optional[Tup
     if st == GOAL:
         return None, True
 
-    q = deque([st])
-    parent = {st: None}
+    # 搜索在压缩编码上进行：visited/parent 的键是 int，而不是 9 元 tuple
+    goal = pack(GOAL, N)
+    s0 = pack(st, N)
+    q = deque([(s0, st.index(0))])
+    parent = {s0: None}
 
     while q:
-        s = q.popleft()
-        if s == GOAL:
-            path = [s]
-            while parent[path[-1]] is not None:
-                path.append(parent[path[-1]])
-            path.reverse()  # [start, step1, ..., goal]
-            return (path[1], True)
-
-        for nxt in neighbors_segment_3x3(s):
-            if nxt not in parent:
-                parent[nxt] = s
-                q.append(nxt)
+        s, b = q.popleft()
+        for nxt, nb in neighbors_segment(s, b, N):
+            if nxt in parent:
+                continue
+            parent[nxt] = s
+            if nxt == goal:
+                while parent[nxt] != s0:  # 回溯到起点的下一步
+                    nxt = parent[nxt]
+                return (tuple(unpack(nxt, N)), True)
+            q.append((nxt, nb))
 
     return None, True  # unreachable in normal solvable cases
+
+def bfs_solve_3x3(start: List[int] | Tuple[int, ...]) -> Tuple[Optional[List[int]], int]:
+    """完整最优解：返回 (点击下标序列, 扩展节点数)；不可解时序列为 None。"""
+    st = tuple(start)
+    if st == GOAL:
+        return [], 0
+    goal = pack(GOAL, N)
+    s0 = pack(st, N)
+    q = deque([(s0, st.index(0))])
+    parent = {s0: None}          # code -> (父 code, 点击下标)
+    nodes = 0
+    while q:
+        s, b = q.popleft()
+        nodes += 1
+        for nxt, nb in neighbors_segment(s, b, N):
+            if nxt in parent:
+                continue
+            parent[nxt] = (s, nb)
+            if nxt == goal:
+                moves = []
+                while nxt != s0:
+                    nxt, k = parent[nxt]
+                    moves.append(k)
+                moves.reverse()
+                return moves, nodes
+            q.append((nxt, nb))
+    return None, nodes
+
+def table_solve_3x3(start: List[int] | Tuple[int, ...]) -> Optional[List[int]]:
+    """沿距离表逐步下降得到完整最优解；无表或不可解返回 None。"""
+    if load_distance_table_3x3() is None or distance_3x3(start) is None:
+        return None
+    moves = []
+    s = tuple(start)
+    while s != GOAL:
+        s, _ = table_first_move_3x3(s)
+        moves.append(s.index(0))   # 新空格位置 = 被点击的格子
+    return moves
+
+# ----------------- 预计算距离表 -----------------
+
+def rank_3x3(s) -> int:
+    """9 元排列 -> [0, 9!) 的序号（Lehmer code）。"""
+    r = 0
+    seen = 0
+    for i, v in enumerate(s):
+        r += (v - bin(seen & ((1 << v) - 1)).count("1")) * _FACT[i]
+        seen |= 1 << v
+    return r
+
+def unrank_3x3(r: int) -> Tuple[int, ...]:
+    """rank_3x3 的逆。"""
+    pool = list(range(9))
+    out = []
+    for f in _FACT:
+        d, r = divmod(r, f)
+        out.append(pool.pop(d))
+    return tuple(out)
+
+def ranks_at_distance_3x3(d: int) -> List[int]:
+    """距离恰为 d 的所有状态序号（扫描 mmap 距离表）；无表返回 []。"""
+    mm = load_distance_table_3x3()
+    if mm is None:
+        return []
+    target = bytes([d])
+    out = []
+    i = mm.find(target, _HEADER.size)
+    while i != -1:
+        out.append(i - _HEADER.size)
+        i = mm.find(target, i + 1)
+    return out
+
+def build_distance_table_3x3(path: str = DIST_PATH) -> int:
+    """
+    从 GOAL 出发做一次反向 BFS（段滑动可逆，正反邻居相同），
+    把每个可达状态的距离写入 path。返回最大距离。
+    """
+    dist = bytearray([_UNREACHED]) * _STATES
+    dist[rank_3x3(GOAL)] = 0
+    frontier = [GOAL]
+    d = 0
+    while frontier:
+        nxt_frontier = []
+        for s in frontier:
+            for nxt in neighbors_segment_3x3(s):
+                r = rank_3x3(nxt)
+                if dist[r] == _UNREACHED:
+                    dist[r] = d + 1
+                    nxt_frontier.append(nxt)
+        if nxt_frontier:
+            d += 1
+        frontier = nxt_frontier
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, N, 0))
+        f.write(dist)
+    os.replace(tmp, path)
+    return d
+
+_table: Optional[mmap.mmap] = None
+
+def load_distance_table_3x3(path: str = DIST_PATH) -> Optional[mmap.mmap]:
+    """只读 mmap 距离表（多进程共享同一份页缓存）；文件缺失或版本不符返回 None。"""
+    global _table
+    if _table is not None:
+        return _table
+    try:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(mm) != _HEADER.size + _STATES or _HEADER.unpack_from(mm) != (_MAGIC, _VERSION, N, 0):
+        mm.close()
+        return None
+    _table = mm
+    return _table
+
+def distance_3x3(state: List[int] | Tuple[int, ...]) -> Optional[int]:
+    """查表得到到 GOAL 的最少段滑动步数；无表或不可解返回 None。"""
+    mm = load_distance_table_3x3()
+    if mm is None:
+        return None
+    d = mm[_HEADER.size + rank_3x3(state)]
+    return None if d == _UNREACHED else d
+
+def table_first_move_3x3(start: List[int] | Tuple[int, ...]) -> Tuple[Optional[Tuple[int, ...]], bool]:
+    """查表版 Hint：选距离为 d-1 的邻居。返回值同 bfs_first_move_3x3；无表时返回 (None, False)。"""
+    mm = load_distance_table_3x3()
+    if mm is None:
+        return None, False
+    st = tuple(start)
+    if st == GOAL:
+        return None, True
+    d = mm[_HEADER.size + rank_3x3(st)]
+    if d == _UNREACHED:
+        return None, True
+    for nxt in neighbors_segment_3x3(st):
+        if mm[_HEADER.size + rank_3x3(nxt)] == d - 1:
+            return nxt, True
+    return None, True
+
+def first_move_3x3(start: List[int] | Tuple[int, ...]) -> Tuple[Optional[Tuple[int, ...]], bool]:
+    """优先查表，表不存在时退回实时 BFS。"""
+    nxt, ok = table_first_move_3x3(start)
+    if ok:
+        return nxt, ok
+    return bfs_first_move_3x3(start)
+
+if __name__ == "__main__":
+    # 一次性生成：cd src && python -m hint.hint_3x3
+    print(f"max distance = {build_distance_table_3x3()}, written to {DIST_PATH}")
@@ -0,0 +1,147 @@
+# Hint 结果缓存：键为 (尺寸, 压缩盘面)，内存中按 LRU 淘汰，可落盘到 data/hint_cache.bin 供下次启动预热。
+from __future__ import annotations
+import os, struct, threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from core_packed import cell_bits
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data")
+CACHE_PATH = os.path.join(DATA_DIR, "hint_cache.bin")
+CAPACITY = 200_000
+
+MISS = object()        # get() 未命中
+_NO_MOVE = 0xFF        # 文件里表示「没有可给的提示」（内存中为 None）
+
+_MAGIC = b"NPHC"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHBB")     # magic, version, reserved, reserved
+_ENTRY = struct.Struct("<BB")         # n, 点击下标（后接压缩盘面 _code_len(n) 字节）
+
+def _code_len(n: int) -> int:
+    return (cell_bits(n) * n * n + 7) // 8
+
+class HintCache:
+    """线程安全的 LRU；值为点击下标或 None（已知无提示）。hits / misses 用于评估容量。"""
+    def __init__(self, capacity: int = CAPACITY, path: Optional[str] = CACHE_PATH):
+        self.capacity = capacity
+        self.path = path
+        self._data: OrderedDict[Tuple[int, int], Optional[int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._loaded = False      # 磁盘上的旧条目是否已读入（未读入时 save 先合并，避免覆盖）
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Tuple[int, int]) -> bool:
+        """只查不计数（预取判断用）；与 put / 驱逐并发，同样要加锁。"""
+        with self._lock:
+            return key in self._data
+
+    def get(self, n: int, code: int):
+        """命中返回点击下标（或 None），未命中返回 MISS。"""
+        key = (n, code)
+        with self._lock:
+            v = self._data.get(key, MISS)
+            if v is MISS:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._data.move_to_end(key)
+            return v
+
+    def put(self, n: int, code: int, move: Optional[int]):
+        key = (n, code)
+        with self._lock:
+            self._data[key] = move
+            self._data.move_to_end(key)
+            if len(self._data) > self.capacity:
+                self._data.popitem(last=False)
+            self._dirty = True
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {"size": len(self._data), "capacity": self.capacity, "hits": self.hits,
+                "misses": self.misses, "hit_rate": self.hits / total if total else 0.0}
+
+    # ---------------- 持久化 ----------------
+    def load(self) -> int:
+        """读入缓存文件（旧 -> 新的顺序，保持 LRU 次序）；文件缺失或版本不符时忽略。返回读入条数。"""
+        if not self.path:
+            return 0
+        try:
+            with open(self.path, "rb") as f:
+                raw = f.read()
+        except OSError:
+            self._loaded = True
+            return 0
+        if len(raw) < _HEADER.size or _HEADER.unpack_from(raw)[:2] != (_MAGIC, _VERSION):
+            self._loaded = True
+            return 0
+        entries = []
+        at = _HEADER.size
+        while at + _ENTRY.size <= len(raw):
+            n, move = _ENTRY.unpack_from(raw, at)
+            at += _ENTRY.size
+            k = _code_len(n)
+            if at + k > len(raw):
+                break
+            entries.append(((n, int.from_bytes(raw[at:at + k], "little")), None if move == _NO_MOVE else move))
+            at += k
+        with self._lock:
+            old = self._data
+            self._data = OrderedDict(entries[-self.capacity:])
+            for key, move in old.items():     # 本进程已有的结果更新
+                self._data[key] = move
+                self._data.move_to_end(key)
+            while len(self._data) > self.capacity:
+                self._data.popitem(last=False)
+            self._loaded = True
+        return len(entries)
+
+    def save(self) -> bool:
+        """有新条目时整体写出（临时文件 + os.replace）。请在 UI 线程退出前调用，不要放在守护线程里。"""
+        if not self.path:
+            return False
+        if self._dirty and not self._loaded:
+            self.load()             # 后台预热还没读盘：先合并磁盘上的旧条目
+        with self._lock:
+            if not self._dirty:
+                return False
+            items = list(self._data.items())
+            self._dirty = False
+        out = bytearray(_HEADER.pack(_MAGIC, _VERSION, 0, 0))
+        for (n, code), move in items:
+            out += _ENTRY.pack(n, _NO_MOVE if move is None else move)
+            out += code.to_bytes(_code_len(n), "little")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(out)
+        os.replace(tmp, self.path)
+        return True
+
+_cache: Optional[HintCache] = None
+_cache_lock = threading.Lock()
+_warmed = False
+
+def hint_cache() -> HintCache:
+    """进程内共享的缓存（不读盘，UI 线程可直接调用）。"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HintCache()
+        return _cache
+
+def warm_hint_cache() -> HintCache:
+    """首次调用时从磁盘预热（放在后台线程里做）。"""
+    global _warmed
+    c = hint_cache()
+    with _cache_lock:
+        if _warmed:
+            return c
+        _warmed = True
+    c.load()
+    return c
@@ -0,0 +1,201 @@
+# k×k 最优解：段滑动度量下的 IDA*（原地修改状态，不复制 tuple）。
+from __future__ import annotations
+import time
+from bisect import bisect_left
+from typing import List, NamedTuple, Optional, Sequence
+from hint.hint_pdb import load_pdb, tile_positions
+
+_FOUND = -1
+_INF = 10**9
+
+class IdaResult(NamedTuple):
+    moves: Optional[List[int]]  # 点击序列（被点格子的下标）；None 表示预算内未解出
+    nodes: int                  # 扩展节点数
+    bound: int                  # 已证明的最优步数下界
+
+class _BudgetExceeded(Exception):
+    pass
+
+# ----------------- 启发式 -----------------
+
+def _lis_len(seq: List[int]) -> int:
+    tails: List[int] = []
+    for x in seq:
+        i = bisect_left(tails, x)
+        if i == len(tails):
+            tails.append(x)
+        else:
+            tails[i] = x
+    return len(tails)
+
+def _row_conflict(s: List[int], n: int, r: int) -> int:
+    """第 r 行中目标也在第 r 行的块，至少有几个必须离开本行（= 个数 - LIS）。"""
+    seq = [(v-1) % n for v in s[r*n:(r+1)*n] if v and (v-1) // n == r]
+    return len(seq) - _lis_len(seq)
+
+def _col_conflict(s: List[int], n: int, c: int) -> int:
+    seq = [(v-1) // n for v in s[c::n] if v and (v-1) % n == c]
+    return len(seq) - _lis_len(seq)
+
+def segment_lower_bound(state: Sequence[int], n: int) -> int:
+    """
+    段滑动可采纳下界：
+    - 横向一次段滑动最多让 n-1 个块各移动一列，竖向同理；
+    - 横向总工作量 = 列距离和 + 2*列冲突数，竖向 = 行距离和 + 2*行冲突数；
+    - 下界 = ceil(横向/(n-1)) + ceil(竖向/(n-1))。
+    """
+    s = list(state)
+    H = V = 0
+    for i, v in enumerate(s):
+        if v:
+            r, c = divmod(i, n)
+            gr, gc = divmod(v-1, n)
+            H += abs(gc - c)
+            V += abs(gr - r)
+    H += 2 * sum(_col_conflict(s, n, c) for c in range(n))
+    V += 2 * sum(_row_conflict(s, n, r) for r in range(n))
+    d = n - 1
+    return -(-H // d) + -(-V // d)
+
+# ----------------- 搜索 -----------------
+
+class _Search:
+    def __init__(self, state: List[int], n: int, max_nodes: int, deadline: float, cancel):
+        self.s = state
+        self.n = n
+        self.b = state.index(0)
+        self.max_nodes = max_nodes
+        self.deadline = deadline
+        self.cancel = cancel
+        self.nodes = 0
+        self.path: List[int] = []
+        # 距离与冲突分开维护，移动时只更新被滑动的那一段
+        self.H = self.V = 0
+        for i, v in enumerate(state):
+            if v:
+                r, c = divmod(i, n)
+                gr, gc = divmod(v-1, n)
+                self.H += abs(gc - c)
+                self.V += abs(gr - r)
+        self.lr = [_row_conflict(state, n, r) for r in range(n)]
+        self.lc = [_col_conflict(state, n, c) for c in range(n)]
+        self.LR = sum(self.lr)
+        self.LC = sum(self.lc)
+        # 有模式数据库时取两者较大值（都可采纳）
+        self.pdb = load_pdb(n)
+        self.pos = tile_positions(state)
+
+    def h(self) -> int:
+        d = self.n - 1
+        h = -(-(self.H + 2*self.LC) // d) + -(-(self.V + 2*self.LR) // d)
+        if self.pdb is not None and h:
+            h = max(h, self.pdb.segment_bound(self.pos))
+        return h
+
+    def slide(self, k: int):
+        """原地执行「点击 k」：空格与 k 同行/列，整段平移。"""
+        s, n, b = self.s, self.n, self.b
+        horizontal = k // n == b // n
+        step = 1 if horizontal else n
+        if k < b:   # 块沿 +step 方向移动
+            for i in range(b, k, -step):
+                v = s[i] = s[i-step]
+                self.pos[v] = i
+                g = (v-1) % n if horizontal else (v-1) // n
+                p = i % n if horizontal else i // n
+                delta = abs(g - p) - abs(g - p + 1)
+                if horizontal: self.H += delta
+                else: self.V += delta
+        else:       # 块沿 -step 方向移动
+            for i in range(b, k, step):
+                v = s[i] = s[i+step]
+                self.pos[v] = i
+                g = (v-1) % n if horizontal else (v-1) // n
+                p = i % n if horizontal else i // n
+                delta = abs(g - p) - abs(g - p - 1)
+                if horizontal: self.H += delta
+                else: self.V += delta
+        s[k] = 0
+        self.pos[0] = k
+        self.b = k
+        # 横滑不改变本行块的相对顺序，只影响经过的那些列的列冲突；竖滑同理
+        if horizontal:
+            lo, hi = sorted((k % n, b % n))
+            for c in range(lo, hi+1):
+                x = _col_conflict(s, n, c)
+                self.LC += x - self.lc[c]
+                self.lc[c] = x
+        else:
+            lo, hi = sorted((k // n, b // n))
+            for r in range(lo, hi+1):
+                x = _row_conflict(s, n, r)
+                self.LR += x - self.lr[r]
+                self.lr[r] = x
+
+    def dfs(self, g: int, bound: int, last_axis: int) -> int:
+        h = self.h()
+        f = g + h
+        if f > bound:
+            return f
+        if h == 0:
+            return _FOUND
+        self.nodes += 1
+        if self.nodes >= self.max_nodes:
+            raise _BudgetExceeded
+        if not (self.nodes & 1023) and (time.perf_counter() > self.deadline
+                                        or (self.cancel is not None and self.cancel.is_set())):
+            raise _BudgetExceeded
+
+        n, b = self.n, self.b
+        r, c = divmod(b, n)
+        best = _INF
+        # 剪枝：同一行（列）上连续两次滑动等价于一次滑动（或回到原状），
+        # 所以上一步横滑后只考虑竖滑，反之亦然（包含「不走回头路」）。
+        for axis, cells in ((0, range(r*n, (r+1)*n)), (1, range(c, n*n, n))):
+            if axis == last_axis:
+                continue
+            for k in cells:
+                if k == b:
+                    continue
+                self.slide(k)
+                self.path.append(k)
+                t = self.dfs(g + 1, bound, axis)
+                if t == _FOUND:
+                    return _FOUND
+                self.path.pop()
+                self.slide(b)
+                if t < best:
+                    best = t
+        return best
+
+def ida_available(n: int) -> bool:
+    """
+    4×4 起只靠冲突下界太弱，只有该尺寸的模式库文件存在时才跑 IDA*；
+    否则调用方应直接用分阶段降维解（能解但非最优）。
+    即使有模式库，4×4 随机局面 5 s 内也基本解不出，亚秒预算内能解的是离终局较近的局面。
+    """
+    return n <= 3 or load_pdb(n) is not None
+
+def ida_star(state: Sequence[int], n: int, max_nodes: int = 300_000, time_limit: float = 0.5,
+             max_cost: Optional[int] = None, cancel=None) -> IdaResult:
+    """
+    段滑动最优解。返回完整点击序列；超出 max_nodes / time_limit 或 cancel 被置位时 moves 为 None。
+    max_cost：若已证明最优步数 > max_cost，立即返回（moves=None, bound>max_cost）。
+    """
+    st = _Search(list(state), n, max_nodes, time.perf_counter() + time_limit, cancel)
+    bound = st.h()
+    while True:
+        if max_cost is not None and bound > max_cost:
+            return IdaResult(None, st.nodes, bound)
+        try:
+            t = st.dfs(0, bound, -1)
+        except _BudgetExceeded:
+            return IdaResult(None, st.nodes, bound)
+        if t == _FOUND:
+            return IdaResult(st.path[:], st.nodes, bound)
+        bound = t
+
+def ida_first_move(state: Sequence[int], n: int, **budget) -> Optional[int]:
+    """Hint 用：返回最优解第一步要点击的下标；已是目标或预算不足返回 None。"""
+    res = ida_star(state, n, **budget)
+    return res.moves[0] if res.moves else None
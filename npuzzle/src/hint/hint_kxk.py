@@ -66,13 +66,100 @@ def _locked_mask(state: Tuple[int,...], n: int) -> set[int]:
 
     return locked
 
+_MD_TABLES: dict[int, List[int]] = {}
+_LOCK_CELLS: dict[Tuple[int,int,int], frozenset[int]] = {}
+
+def _md_table(n: int) -> List[int]:
+    """md[v*n*n + i] = 块 v 在格 i 时的曼哈顿距离（v=0 为 0）。"""
+    tab = _MD_TABLES.get(n)
+    if tab is None:
+        NN = n*n
+        tab = [0] * (NN*NN)
+        for v in range(1, NN):
+            gr, gc = divmod(v-1, n)
+            for i in range(NN):
+                r, c = divmod(i, n)
+                tab[v*NN + i] = abs(gr - r) + abs(gc - c)
+        _MD_TABLES[n] = tab
+    return tab
+
+class _Locked:
+    """
+    与 _locked_mask 等价的锁定区，但由「每行/每列未到位格子数」推出：
+    前 R 行整行到位、前 C 列整列到位 -> 第 r 行或第 c 列在前缀内即锁定。
+    一次段滑动只改一段格子，所以计数可以 O(段长) 增量更新。
+    """
+    __slots__ = ("n", "row_bad", "col_bad", "R", "C", "cells")
+
+    def __init__(self, n: int, row_bad: List[int], col_bad: List[int]):
+        self.n = n
+        self.row_bad = row_bad
+        self.col_bad = col_bad
+        self.R = self._prefix(row_bad)
+        self.C = self._prefix(col_bad)
+        key = (n, self.R, self.C)
+        cells = _LOCK_CELLS.get(key)
+        if cells is None:
+            cells = _LOCK_CELLS[key] = frozenset(
+                i for i in range(n*n) if i // n < self.R or i % n < self.C)
+        self.cells = cells
+
+    @staticmethod
+    def _prefix(bad: List[int]) -> int:
+        k = 0
+        while k < len(bad) and bad[k] == 0:
+            k += 1
+        return k
+
+    @classmethod
+    def of(cls, state: Tuple[int,...], n: int) -> "_Locked":
+        goal = _goal_of(n)
+        row_bad = [0] * n
+        col_bad = [0] * n
+        for i, v in enumerate(state):
+            if v != goal[i]:
+                row_bad[i // n] += 1
+                col_bad[i % n] += 1
+        return cls(n, row_bad, col_bad)
+
+    def after(self, state: Tuple[int,...], nxt: Tuple[int,...], cells: range) -> "_Locked":
+        """state -> nxt 只改变了 cells 中的格子，返回 nxt 的锁定区。"""
+        NN = self.n * self.n
+        row_bad = self.row_bad[:]
+        col_bad = self.col_bad[:]
+        n = self.n
+        for i in cells:
+            g = (i + 1) % NN
+            d = (nxt[i] != g) - (state[i] != g)
+            if d:
+                row_bad[i // n] += d
+                col_bad[i % n] += d
+        return _Locked(n, row_bad, col_bad)
+
+    def __contains__(self, idx: int) -> bool:
+        return idx in self.cells
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, _Locked) and (self.R, self.C) == (other.R, other.C)
+
+def _segment_cells(z: int, k: int, n: int) -> range:
+    """空格 z 与被点格 k 之间（含两端）的下标。"""
+    step = 1 if z // n == k // n else n
+    return range(min(z, k), max(z, k) + 1, step)
+
 # ----------------- 段滑动邻居 -----------------
 
-def _neighbors_segment(state: Tuple[int,...], n: int) -> Iterable[Tuple[Tuple[int,...], int]]:
+def _neighbors_segment(state: Tuple[int,...], n: int, locked=None) -> Iterable[Tuple[Tuple[int,...], int, int]]:
     """
     生成所有一次「段滑动」邻居。
-    返回 (next_state, moved_index)：
+    返回 (next_state, moved_index, delta)：
     - moved_index 表示用户若点击该 index 的格子，就会产生这个 next_state（仅用于调试/打分）。
+    - delta = _eval_state(next_state, locked) - _eval_state(state, locked)；
+      同方向的段是逐格加长的，沿途累加每个被推动块的贡献变化，每个邻居 O(1)；
+      locked 为 None 时恒为 0。
     规则：
     - 空格与同一行/列的任一格均可选择，选中后空格会与路径上所有格按方向整体交换（整段平移）。
     """
@@ -80,44 +167,73 @@ def _neighbors_segment(state: Tuple[int,...], n: int) -> Iterable[Tuple[Tuple[in
     z = s_list.index(0)
     br, bc = divmod(z, n)
 
+    if locked is None:
+        def sc(v: int, i: int) -> int:
+            return 0
+    else:
+        cells = locked.cells
+        md = _md_table(n)
+        NN = n*n
+        def sc(v: int, i: int) -> int:
+            if i in cells:
+                return 10 if v != (i + 1) % NN else 0
+            return md[v*NN + i]
+    blank_out = sc(0, z)
+
     # 同一行
     # 左侧 -> 往右推
+    acc = 0
     for c in range(bc-1, -1, -1):
+        j = br*n + c
+        v = s_list[j]
+        acc += sc(v, j+1) - sc(v, j)
         lst = s_list[:]
         # c..bc-1 右移一格，空格到 c
         for cc in range(bc, c, -1):
             lst[br*n + cc] = lst[br*n + (cc-1)]
-        lst[br*n + c] = 0
-        yield (tuple(lst), br*n + c)
+        lst[j] = 0
+        yield (tuple(lst), j, acc + sc(0, j) - blank_out)
 
     # 右侧 -> 往左推
+    acc = 0
     for c in range(bc+1, n):
+        j = br*n + c
+        v = s_list[j]
+        acc += sc(v, j-1) - sc(v, j)
         lst = s_list[:]
         for cc in range(bc, c):
             lst[br*n + cc] = lst[br*n + (cc+1)]
-        lst[br*n + c] = 0
-        yield (tuple(lst), br*n + c)
+        lst[j] = 0
+        yield (tuple(lst), j, acc + sc(0, j) - blank_out)
 
     # 同一列
     # 上侧 -> 往下推
+    acc = 0
     for r in range(br-1, -1, -1):
+        j = r*n + bc
+        v = s_list[j]
+        acc += sc(v, j+n) - sc(v, j)
         lst = s_list[:]
         for rr in range(br, r, -1):
             lst[rr*n + bc] = lst[(rr-1)*n + bc]
-        lst[r*n + bc] = 0
-        yield (tuple(lst), r*n + bc)
+        lst[j] = 0
+        yield (tuple(lst), j, acc + sc(0, j) - blank_out)
 
     # 下侧 -> 往上推
+    acc = 0
     for r in range(br+1, n):
+        j = r*n + bc
+        v = s_list[j]
+        acc += sc(v, j-n) - sc(v, j)
         lst = s_list[:]
         for rr in range(br, r):
             lst[rr*n + bc] = lst[(rr+1)*n + bc]
-        lst[r*n + bc] = 0
-        yield (tuple(lst), r*n + bc)
+        lst[j] = 0
+        yield (tuple(lst), j, acc + sc(0, j) - blank_out)
 
 # ----------------- 评估函数 -----------------
 
-def _eval_state(state: Tuple[int,...], n: int, locked: set[int]) -> int:
+def _eval_state(state: Tuple[int,...], n: int, locked) -> int:
     """
     启发式评分：越小越好
     - 基础：未锁格子的曼哈顿距离和
@@ -139,26 +255,29 @@ def next_state_after_one_segment(state_list: List[int], n: int) -> Optional[Tupl
     """
     给定当前盘面（扁平列表）和尺寸 n，返回「执行一次段滑动」后的下一状态（作为 Hint）。
     若已经是目标或找不到更优动作，返回 None。
+    邻居分数均由父状态分数 + 段增量得到，不再整盘重算。
     """
     cur = tuple(state_list)
     goal = _goal_of(n)
     if cur == goal:
         return None
 
-    locked = _locked_mask(cur, n)
+    locked = _Locked.of(cur, n)
     cur_score = _eval_state(cur, n, locked)
+    zr, zc = _rc(cur.index(0), n)
 
     # 先尝试一步贪心
     best_next = None
     best_score = 10**9
     best_len = 10**9  # 鼓励短距离移动（更可控）
-    for nxt, moved_idx in _neighbors_segment(cur, n):
+    first_layer = []
+    for nxt, moved_idx, delta in _neighbors_segment(cur, n, locked):
+        first_layer.append((nxt, moved_idx, delta))
         # 移动长度 = 曼哈顿距离中空格沿行/列走的长度
-        zr, zc = _rc(cur.index(0), n)
         r, c = _rc(moved_idx, n)
         move_len = abs(zr - r) + abs(zc - c)
 
-        score = _eval_state(nxt, n, locked)
+        score = cur_score + delta
         if (score < best_score) or (score == best_score and move_len < best_len):
             best_score = score
             best_len = move_len
@@ -173,18 +292,17 @@ def next_state_after_one_segment(state_list: List[int], n: int) -> Optional[Tupl
     best_two_score = 10**9
     best_two_len = 10**9
 
-    first_layer = list(_neighbors_segment(cur, n))
-    for s1, idx1 in first_layer:
-        locked1 = _locked_mask(s1, n)
-        s1_score = _eval_state(s1, n, locked1)
+    z = cur.index(0)
+    for s1, idx1, delta1 in first_layer:
+        # 锁定区按被滑动的那一段增量更新；锁定区不变时 s1 的分数也可直接由增量得到
+        locked1 = locked.after(cur, s1, _segment_cells(z, idx1, n))
+        s1_score = cur_score + delta1 if locked1 == locked else _eval_state(s1, n, locked1)
+        r1, c1 = _rc(idx1, n)
+        len1 = abs(zr - r1) + abs(zc - c1)
         # 直接允许第一步让分数更差，但只要第二步能显著下降即可
-        for s2, idx2 in _neighbors_segment(s1, n):
-            score2 = _eval_state(s2, n, locked1)
+        for s2, idx2, delta2 in _neighbors_segment(s1, n, locked1):
+            score2 = s1_score + delta2
             # 估计“总代价”：末端评分 + 第一移动长度（微弱正则）
-            zr, zc = _rc(cur.index(0), n)
-            r1, c1 = _rc(idx1, n)
-            len1 = abs(zr - r1) + abs(zc - c1)
-
             if (score2 < best_two_score) or (score2 == best_two_score and len1 < best_two_len):
                 best_two_score = score2
                 best_two_len = len1
@@ -194,4 +312,4 @@ def next_state_after_one_segment(state_list: List[int], n: int) -> Optional[Tupl
         return best_first
 
     # 实在找不到改进（极少数局面），返回贪心一步作为 fallback
-    return best_next
\ No newline at end of file
+    return best_next
@@ -0,0 +1,88 @@
+# 整局 Hint 计划：保存整条解路径上每个盘面的「下一步 + 剩余步数」，玩家沿着走时每次 Hint 只是一次查表。
+# 偏离路径后先在几步之内搜回任一计划过的盘面并拼接；搜不回才需要后台重新求解（hint_worker）。
+from __future__ import annotations
+from collections import deque
+from typing import Dict, Optional, Sequence, Tuple
+from core_packed import neighbors_segment, pack, slide
+from hint.hint_cache import MISS
+
+RECONNECT_RADIUS = 2    # 偏离后局部搜索的点击数上限（分支约 2(n-1)，两步以内每次不到 1ms）
+
+class Planner:
+    """
+    一局内的计划表：压缩盘面 -> (下一步点击下标, 剩余步数)。
+    表中每个盘面的下一步都通向另一个表中盘面（剩余步数少 1），所以旧路径拼接后依然有效，无需删除。
+    """
+    def __init__(self, n: int, radius: int = RECONNECT_RADIUS):
+        self.n = n
+        self.radius = radius
+        self._step: Dict[int, Tuple[Optional[int], int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._step)
+
+    def clear(self):
+        self._step.clear()
+
+    def _put(self, code: int, move: Optional[int], left: int):
+        old = self._step.get(code)
+        if old is None or left < old[1]:
+            self._step[code] = (move, left)
+
+    def adopt(self, state: Sequence[int], moves: Sequence[int]):
+        """记下从 state 出发的一条完整解（点击序列）。"""
+        n = self.n
+        c, b = pack(state, n), list(state).index(0)
+        left = len(moves)
+        for k in moves:
+            self._put(c, k, left)
+            c, b, left = slide(c, b, k, n), k, left - 1
+        self._put(c, None, 0)
+
+    def next_move(self, state: Sequence[int]):
+        """O(1)：计划中的下一步（已到终局为 None）；不在计划上返回 MISS。"""
+        hit = self._step.get(pack(state, self.n))
+        return MISS if hit is None else hit[0]
+
+    def remaining(self, state: Sequence[int]) -> Optional[int]:
+        """按当前计划还要走的步数；不在计划上返回 None。"""
+        hit = self._step.get(pack(state, self.n))
+        return None if hit is None else hit[1]
+
+    def follow(self, state: Sequence[int]) -> bool:
+        """盘面变化后调用：在计划上，或在 radius 步内能接回计划（接回的几步写入计划）时返回 True。"""
+        code = pack(state, self.n)
+        if code in self._step:
+            return True
+        return bool(self._step) and self._reconnect(code, list(state).index(0))
+
+    def _reconnect(self, code: int, blank: int) -> bool:
+        """有界 BFS：找最浅能接上计划的深度，取其中「已走步数 + 剩余步数」最小的盘面，把这段前缀拼进计划。"""
+        n = self.n
+        parent: Dict[int, Tuple[int, int]] = {code: (code, -1)}
+        best: Optional[Tuple[int, int, int]] = None         # (总步数, 盘面, 深度)
+        q = deque([(code, blank, 0)])
+        while q:
+            c, b, d = q.popleft()
+            if d == self.radius or (best is not None and d >= best[2]):
+                break                       # 队列按深度有序：更浅处已接上就不再往深处找
+            for c2, k in neighbors_segment(c, b, n):
+                if c2 in parent:
+                    continue
+                parent[c2] = (c, k)
+                hit = self._step.get(c2)
+                if hit is not None:
+                    if best is None or d + 1 + hit[1] < best[0]:
+                        best = (d + 1 + hit[1], c2, d + 1)
+                    continue
+                q.append((c2, k, d + 1))
+        if best is None:
+            return False
+        total, c, depth = best
+        left = total - depth
+        while c != code:
+            prev, k = parent[c]
+            left += 1
+            self._put(prev, k, left)
+            c = prev
+        return True
@@ -0,0 +1,234 @@
+# 分阶段（降维）求解 k×k：逐块归位首行、首列并锁定，递归到右下角 3×3，再用 3×3 距离表精确收尾。
+# 不追求最优，但每一阶段都有保证，步数与耗时都随盘面大小近似线性增长；用于 5×5 及以上的 Hint / 批量求解。
+from __future__ import annotations
+from collections import deque
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+# ----------------- 搬运：抽象状态 BFS 与逐格挪动 -----------------
+
+def _rays(b: int, n: int, walls: bytearray) -> Iterator[Tuple[int, int]]:
+    """从空格 b 出发沿四个方向可以点击的格子：(被点格, 方向步长)；遇到墙（已锁定 / 区域外）即停。"""
+    r, c = divmod(b, n)
+    for d, length in ((-n, r), (n, n - 1 - r), (-1, c), (1, n - 1 - c)):
+        k = b
+        for _ in range(length):
+            k += d
+            if walls[k]:
+                break
+            yield k, d
+
+def _push(t: int, b: int, k: int, d: int, n: int) -> int:
+    """点击 k 后位置 t 上的块的新位置：在 b+d .. k 之间（同一条线上）的块朝空格退一格。"""
+    if (t - b) * d > 0 and (k - t) * d >= 0 and (d in (1, -1) or (t - b) % n == 0):
+        return t - d
+    return t
+
+def _search(state: Sequence[int], n: int, walls: bytearray, tiles: Tuple[int, ...], done) -> Optional[List[int]]:
+    """
+    BFS：抽象状态 = (所跟踪块的位置..., 空格位置)，其余未锁定的块随意。
+    done(positions, blank) 为真即停；返回点击序列（不可达返回 None）。
+    """
+    b0 = list(state).index(0)
+    if done(tiles, b0):
+        return []
+    start = tiles + (b0,)
+    parent = {start: None}
+    q = deque([start])
+    while q:
+        node = q.popleft()
+        b = node[-1]
+        for k, d in _rays(b, n, walls):
+            nxt = tuple(_push(t, b, k, d, n) for t in node[:-1]) + (k,)
+            if nxt in parent:
+                continue
+            parent[nxt] = (node, k)
+            if done(nxt[:-1], k):
+                moves = []
+                while parent[nxt] is not None:
+                    nxt, kk = parent[nxt]
+                    moves.append(kk)
+                moves.reverse()
+                return moves
+            q.append(nxt)
+    return None
+
+def _walk(s: List[int], n: int, walls: bytearray, tile: int, goal) -> Iterator[int]:
+    """
+    把块 tile 一格一格挪到 goal(位置) 为真的格子（边产出边执行）：
+    每一格先让空格绕开该块走到下一格（只搜空格，O(格数)），再点击该块。
+    下一格选不出或空格到不了时退回 (块, 空格) 联合 BFS，保证总能完成。
+    """
+    t = s.index(tile)
+    while not goal(t):
+        r, c = divmod(t, n)
+        gr, gc = divmod(_nearest(t, n, goal, walls), n)
+        steps = sorted((abs(r2 - gr) + abs(c2 - gc), r2 * n + c2)
+                       for r2, c2 in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1))
+                       if 0 <= r2 < n and 0 <= c2 < n and not walls[r2 * n + c2])
+        walls[t] = 1
+        path = None
+        for _, nxt in steps[:2]:
+            path = _direct(s.index(0), nxt, n, walls)
+            if path is None:
+                path = _blank_path(s.index(0), n, walls, lambda i, c=nxt: i == c)
+            if path is not None:
+                path.append(t)
+                break
+        walls[t] = 0
+        if path is None:
+            path = _search(s, n, walls, (t,), lambda p, _b: goal(p[0]))
+            if path is None:
+                raise ValueError("reduction stage failed (unsolvable board?)")
+        for k in path:
+            _apply(s, n, k)
+            yield k
+        t = s.index(tile)
+
+def _clear(b: int, k: int, n: int, walls: bytearray) -> bool:
+    """空格 b 与格子 k 在同一行 / 列且中间（含 k）没有墙。"""
+    if b == k:
+        return True
+    if b // n == k // n:
+        d = 1 if k > b else -1
+    elif b % n == k % n:
+        d = n if k > b else -n
+    else:
+        return False
+    return not any(walls[i] for i in range(b + d, k + d, d))
+
+def _direct(b: int, k: int, n: int, walls: bytearray) -> Optional[List[int]]:
+    """空格最多两次点击（先横后竖或先竖后横）走到 k；走不通返回 None（再交给 BFS）。"""
+    if _clear(b, k, n, walls):
+        return [] if b == k else [k]
+    for mid in ((b // n) * n + k % n, (k // n) * n + b % n):
+        if _clear(b, mid, n, walls) and _clear(mid, k, n, walls):
+            return [mid, k]
+    return None
+
+def _blank_path(b: int, n: int, walls: bytearray, goal) -> Optional[List[int]]:
+    """只移动空格：按单格 BFS 找路，再把同一方向的连续几格合成一次点击。"""
+    if goal(b):
+        return []
+    prev = {b: b}
+    q = deque([b])
+    while q:
+        i = q.popleft()
+        r, c = divmod(i, n)
+        for j in (i - n if r else -1, i + n if r < n - 1 else -1, i - 1 if c else -1, i + 1 if c < n - 1 else -1):
+            if j < 0 or j in prev or walls[j]:
+                continue
+            prev[j] = i
+            if goal(j):
+                cells = [j]
+                while cells[-1] != b:
+                    cells.append(prev[cells[-1]])
+                cells.reverse()
+                clicks = []
+                for x, y, z in zip(cells, cells[1:], cells[2:] + [None]):
+                    if z is None or z - y != y - x:
+                        clicks.append(y)
+                return clicks
+            q.append(j)
+    return None
+
+def _nearest(t: int, n: int, goal, walls: bytearray) -> int:
+    """离 t 最近（曼哈顿距离）的目标格。"""
+    r, c = divmod(t, n)
+    return min((i for i in range(n * n) if goal(i) and not walls[i]),
+               key=lambda i: abs(i // n - r) + abs(i % n - c))
+
+# ----------------- 阶段划分 -----------------
+
+def _apply(s: List[int], n: int, k: int) -> int:
+    """原地点击 k，返回 k（新空格位置）。"""
+    b = s.index(0)
+    step = 1 if k // n == b // n else n
+    d = step if k < b else -step
+    for i in range(b, k, -d):
+        s[i] = s[i - d]
+    s[k] = 0
+    return k
+
+def _line_plan(lo: int, n: int, row: bool) -> Tuple[List[int], Tuple[int, int], List[int]]:
+    """
+    第 lo 行（row=True，列 lo..n-1）或第 lo 列（行 lo+1..n-1）：
+    (逐个放置的目标格, 最后两格 (A, B), 收尾窗口)。
+    窗口是紧挨最后两格的 3×3 减去已锁定的一角，共 8 格；A、B 与空格都进窗口后在窗口内联合搜索。
+    """
+    if row:
+        cells = [lo * n + c for c in range(lo, n)]
+        window = [r * n + c for r in range(lo, lo + 3) for c in range(n - 3, n) if (r, c) != (lo, n - 3)]
+    else:
+        cells = [r * n + lo for r in range(lo + 1, n)]
+        window = [r * n + c for r in range(n - 3, n) for c in range(lo, lo + 3) if (r, c) != (n - 3, lo)]
+    return cells[:-2], (cells[-2], cells[-1]), window
+
+def _plan(state: Sequence[int], n: int) -> Iterator[int]:
+    """逐步产出点击下标（边产出边在副本上执行），这样取第一步时只需算第一阶段。"""
+    s = list(state)
+    walls = bytearray(n * n)
+
+    def run(moves: Optional[List[int]]):
+        if moves is None:                  # 可解盘面不会出现；防御性报错便于定位
+            raise ValueError("reduction stage failed (unsolvable board?)")
+        for k in moves:
+            _apply(s, n, k)
+        return moves
+
+    for lo in range(n - 3):
+        for row in (True, False):
+            singles, (a, b), window = _line_plan(lo, n, row)
+            for cell in singles:
+                yield from _walk(s, n, walls, cell + 1, lambda p, c=cell: p == c)
+                walls[cell] = 1
+            if s[a] != a + 1 or s[b] != b + 1:
+                # 最后两格不能逐个放（先放的会把后一个堵在角落）：B、A、空格依次进窗口，再在窗口内联合 BFS。
+                # B 停在窗口中心：它的邻格都在窗口内或已锁定，窗口外的 A 不会被它堵进死角
+                inside = set(window)
+                centre = window[4]
+                yield from _walk(s, n, walls, b + 1, lambda p: p == centre)
+                walls[centre] = 1
+                yield from _walk(s, n, walls, a + 1, lambda p: p in inside)
+                pa = s.index(a + 1)
+                walls[pa] = 1
+                yield from run(_blank_path(s.index(0), n, walls, lambda i: i in inside))
+                walls[pa] = walls[centre] = 0
+                boxed = bytearray(b"\x01") * (n * n)
+                for c in window:
+                    boxed[c] = 0
+                yield from run(_search(s, n, boxed, (s.index(a + 1), s.index(b + 1)),
+                                       lambda p, _b: p[0] == a and p[1] == b))
+            walls[a] = walls[b] = 1
+    yield from _finish_3x3(s, n)
+
+def _finish_3x3(s: List[int], n: int) -> Iterator[int]:
+    """右下角 3×3：块重新编号为 1..8 后查 3×3 距离表（无表时 BFS），点击下标映射回原盘面。"""
+    from hint.hint_3x3 import table_solve_3x3, bfs_solve_3x3
+    o = n - 3
+    cells = [(o + r) * n + (o + c) for r in range(3) for c in range(3)]
+    label = {}
+    for i, cell in enumerate(cells):
+        label[cell + 1] = i + 1            # 目标在该格的块 -> 局部编号
+    sub = tuple(label[s[cell]] if s[cell] else 0 for cell in cells)
+    moves = table_solve_3x3(sub)
+    if moves is None:
+        moves = bfs_solve_3x3(sub)[0]
+    if moves is None:
+        raise ValueError("reduction stage failed (unsolvable board?)")
+    for k in moves:
+        yield cells[k]
+
+# ----------------- 对外接口 -----------------
+
+def reduce_solve(state: Sequence[int], n: int, cancel=None) -> Optional[List[int]]:
+    """完整点击序列（非最优）。n == 3 时直接查表。cancel（threading.Event）被置位时中途放弃，返回 None。"""
+    moves = []
+    for k in _plan(state, n):
+        if cancel is not None and cancel.is_set():
+            return None
+        moves.append(k)
+    return moves
+
+def reduce_first_move(state: Sequence[int], n: int) -> Optional[int]:
+    """Hint 用：第一步点击下标；已是目标返回 None。只计算到出现第一步为止。"""
+    return next(_plan(state, n), None)
@@ -0,0 +1,166 @@
+# 后台 Hint：单个守护线程计算，UI 用 after() 轮询结果，不阻塞 Tk 主循环。
+# 盘面一变就取消正在算的旧局面，并立刻为新局面预取；求出完整解时整条路径都缓存下来。
+from __future__ import annotations
+import threading, time
+from typing import Dict, List, Optional, Sequence, Tuple
+from core_packed import pack, slide
+from hint.hint_cache import MISS, hint_cache, warm_hint_cache
+
+PATIENCE = 0.5          # 最优解未出时，降维解的第一步至少等这么久才采用（与原同步 Hint 的预算一致）
+IDA_TIME_LIMIT = 0.8    # 后台 IDA* 的时间上限：每步都会预取，且计算时占着 GIL，只给亚秒预算
+IDA_MAX_NODES = 100_000 # 有模式库时约 1.2 万节点/秒，通常先到时间上限
+IDA_MAX_SIZE = 5        # 更大的棋盘没有模式库，IDA* 在预算内基本解不出：直接用分阶段降维解
+                        # 4×4/5×5 也只在模式库文件存在时才跑 IDA*（见 ida_available）
+
+def _warm(n: int):
+    """在工作线程里提前导入模块、映射表文件、读入 Hint 缓存，首次 Hint 不再卡顿。"""
+    warm_hint_cache()
+    from hint.hint_3x3 import load_distance_table_3x3
+    load_distance_table_3x3()             # 3×3 直接查表；更大棋盘的降维解也用它收尾
+    if n > 3:
+        import hint.hint_reduce   # noqa: F401
+    if 3 < n <= IDA_MAX_SIZE:
+        from hint.hint_pdb import load_pdb
+        import hint.hint_ida   # noqa: F401
+        load_pdb(n)
+
+def use_ida(n: int) -> bool:
+    """4×4/5×5 且有模式库时才值得后台跑 IDA*；否则 Hint 直接给降维解（非最优）。"""
+    if not 3 < n <= IDA_MAX_SIZE:
+        return False
+    from hint.hint_ida import ida_available
+    return ida_available(n)
+
+def solve_moves(state: Sequence[int], n: int, cancel: threading.Event) -> Optional[List[int]]:
+    """
+    点击序列：3×3 查表、有模式库的 4×4/5×5 用 IDA* 求最优解；
+    其余（大棋盘、没有模式库的 4×4/5×5）为降维解，能解但不保证最短。
+    预算内解不出或被取消返回 None。
+    """
+    if n == 3:
+        from hint.hint_3x3 import table_solve_3x3, bfs_solve_3x3
+        moves = table_solve_3x3(state)
+        return moves if moves is not None else bfs_solve_3x3(state)[0]
+    if not use_ida(n):
+        from hint.hint_reduce import reduce_solve
+        return reduce_solve(state, n, cancel)
+    from hint.hint_ida import ida_star
+    return ida_star(state, n, max_nodes=IDA_MAX_NODES, time_limit=IDA_TIME_LIMIT, cancel=cancel).moves
+
+def quick_move(state: Sequence[int], n: int) -> Optional[int]:
+    """分阶段降维解的第一步：只算到第一阶段，毫秒级，且沿着走一定能收敛。"""
+    from hint.hint_reduce import reduce_first_move
+    return reduce_first_move(state, n)
+
+class HintWorker:
+    """
+    一个棋盘尺寸的 Hint 计算线程。
+    - request(state)：盘面变化后调用；取消旧任务并在后台开始算新局面；
+    - lookup(state)：(是否就绪, 点击下标)；下标为 None 表示没有可给的提示。
+    最终结果（最优解路径上的每一步，或预算用完时降维解路径上的每一步）写入跨局共享的 hint_cache；
+    quick 只在本局内保存先给出的降维解第一步；最近一次求出的完整路径由 take_plan() 交给 UI 的 Planner。
+    共享缓存由 UI 线程在页面销毁时落盘（守护线程在程序退出时可能被直接杀掉）。
+    """
+    def __init__(self, n: int):
+        self.n = n
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._cancel = threading.Event()
+        self._want: Optional[Tuple[int, Tuple[int, ...]]] = None   # 待算：(编码, 盘面)
+        self._busy: Optional[int] = None                           # 正在算的编码
+        self._cache = hint_cache()
+        self._quick: Dict[int, Tuple[Optional[int], float]] = {}   # 编码 -> (降维解第一步, 开始时间)
+        self._plan: Optional[Tuple[Tuple[int, ...], List[int]]] = None   # 最近求出的 (盘面, 完整解)
+        self._closed = False
+        threading.Thread(target=self._run, name=f"hint-{n}", daemon=True).start()
+
+    def request(self, state: Sequence[int]):
+        code = pack(state, self.n)
+        with self._lock:
+            if self._want and self._want[0] == code:
+                return
+            if code == self._busy and not self._cancel.is_set():
+                self._want = None           # 回到正在算的局面：排队的旧请求作废
+                return
+            self._cancel.set()              # 旧局面不再需要（新局面命中缓存时也一样）
+            if (self.n, code) in self._cache:
+                self._want = None
+                return
+            self._want = (code, tuple(state))
+            self._wake.set()
+
+    def lookup(self, state: Sequence[int], patience: float = PATIENCE) -> Tuple[bool, Optional[int]]:
+        code = pack(state, self.n)
+        move = self._cache.get(self.n, code)
+        if move is not MISS:
+            return True, move
+        with self._lock:
+            quick = self._quick.get(code)
+        if quick is not None and time.perf_counter() - quick[1] >= patience:
+            return True, quick[0]
+        return False, None
+
+    def take_plan(self) -> Optional[Tuple[Tuple[int, ...], List[int]]]:
+        """取走最近一次求出的完整解（盘面, 点击序列），没有新结果返回 None。"""
+        with self._lock:
+            plan, self._plan = self._plan, None
+            return plan
+
+    def clear(self):
+        """新开一局：丢弃在途任务与本局的快速结果（共享缓存保留）。"""
+        with self._lock:
+            self._cancel.set()
+            self._want = None
+            self._plan = None
+            self._quick.clear()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._cancel.set()
+            self._wake.set()
+
+    def _run(self):
+        _warm(self.n)
+        while True:
+            self._wake.wait()
+            with self._lock:
+                if self._closed:
+                    break
+                self._wake.clear()
+                if self._want is None:
+                    continue
+                code, state = self._want
+                self._want = None
+                self._busy = code
+                self._cancel = cancel = threading.Event()
+            try:
+                self._solve(code, state, cancel)
+            finally:
+                with self._lock:
+                    self._busy = None
+
+    def _solve(self, code: int, state: Tuple[int, ...], cancel: threading.Event):
+        n = self.n
+        t0 = time.perf_counter()
+        if use_ida(n):
+            # 先给出降维解的第一步兜底，再在剩余时间里求最优解；
+            # 大棋盘直接算整条降维解（15×15 也不到半秒），交给 Planner 后后续 Hint 都是查表
+            move = quick_move(state, n)
+            with self._lock:
+                self._quick[code] = (move, t0)
+        if cancel.is_set():
+            return
+        moves = solve_moves(state, n, cancel)
+        if moves is None and not cancel.is_set():
+            # 预算用完仍未解出：整条降维解路径作为最终结果（沿着走必然到终局）
+            from hint.hint_reduce import reduce_solve
+            moves = reduce_solve(state, n, cancel)
+        if moves is not None:
+            # 大棋盘的盘面几乎不会在别的对局里重现：整条路径只交给 Planner，共享缓存只记当前这一步
+            c, b = code, state.index(0)
+            for k in (moves if n <= IDA_MAX_SIZE else moves[:1]):
+                self._cache.put(n, c, k)
+                c, b = slide(c, b, k, n), k
+            with self._lock:
+                self._plan = (state, moves)
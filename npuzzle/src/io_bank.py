@@ -0,0 +1,139 @@
+# 预生成题库：每个尺寸一个定长记录的二进制文件，开局 O(1) 取一题。
+# 多个游戏进程可共用 data/：取题（读 + 截断）与补库（追加）都在 bank_NxN.bin.lock 的建议锁内完成。
+import os, random, struct, threading
+from contextlib import contextmanager
+from typing import List, NamedTuple, Optional
+from io_leaderboard import DATA_DIR, LeaderboardBusy, _FileLock
+from core_scramble import random_solvable
+
+_MAGIC = b"NPBK"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHBB")   # magic, version, N, reserved
+_META = struct.Struct("<QHB")        # seed, distance, exact（后接 N*N 字节的盘面）
+
+LOW_WATER = 200      # 低于此数量时后台补充
+HIGH_WATER = 2000    # 补充到此数量
+POP_TIMEOUT = 0.2    # UI 线程取题时等锁的上限，拿不到就现场生成
+FILL_TIMEOUT = 5.0   # 后台补库时等锁的上限
+
+class BankPuzzle(NamedTuple):
+    state: List[int]
+    seed: int
+    distance: int     # exact=True 为最优段滑动步数，否则为可采纳下界估计
+    exact: bool
+
+_lock = threading.Lock()          # 同一进程内的读写互斥
+_refilling: set[int] = set()      # 正在后台补充的尺寸
+
+def bank_path(N: int) -> str:
+    return os.path.join(DATA_DIR, f"bank_{N}x{N}.bin")
+
+def _record_size(N: int) -> int:
+    return _META.size + N*N
+
+def _open(N: int):
+    """打开（必要时创建）题库文件；头部不符时重建为空库。"""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = bank_path(N)
+    head = _HEADER.pack(_MAGIC, _VERSION, N, 0)
+    try:
+        f = open(path, "r+b")
+    except FileNotFoundError:
+        f = open(path, "w+b")
+    if f.read(_HEADER.size) != head:
+        f.seek(0)
+        f.truncate()
+        f.write(head)
+    return f
+
+@contextmanager
+def _locked(N: int, timeout: float):
+    """先拿跨进程文件锁（限时，拿不到抛 LeaderboardBusy），再拿进程内的锁并打开题库。"""
+    with _FileLock(timeout, path=bank_path(N) + ".lock"), _lock, _open(N) as f:
+        yield f
+
+def _count(f, N: int) -> int:
+    f.seek(0, os.SEEK_END)
+    return (f.tell() - _HEADER.size) // _record_size(N)
+
+def bank_count(N: int, timeout: float = POP_TIMEOUT) -> int:
+    with _locked(N, timeout) as f:
+        return _count(f, N)
+
+def pop_puzzle(N: int) -> Optional[BankPuzzle]:
+    """取出最后一条记录并截断文件（O(1)）；题库为空或正被别的进程占用返回 None。"""
+    rec = _record_size(N)
+    try:
+        with _locked(N, POP_TIMEOUT) as f:
+            n = _count(f, N)
+            if n == 0:
+                return None
+            at = _HEADER.size + (n - 1) * rec
+            f.seek(at)
+            raw = f.read(rec)
+            f.truncate(at)
+    except LeaderboardBusy:
+        return None
+    seed, dist, exact = _META.unpack_from(raw)
+    return BankPuzzle(list(raw[_META.size:]), seed, dist, bool(exact))
+
+def _make_record(N: int, rnd: random.Random) -> bytes:
+    seed = rnd.getrandbits(63)
+    state = random_solvable(N, seed)
+    dist, exact = None, False
+    if N == 3:
+        from hint.hint_3x3 import distance_3x3
+        dist, exact = distance_3x3(state), True
+    if dist is None:
+        from hint.hint_ida import segment_lower_bound
+        dist, exact = segment_lower_bound(state, N), False
+    return _META.pack(seed, dist, int(exact)) + bytes(state)
+
+def fill_bank(N: int, target: int = HIGH_WATER, chunk: int = 100) -> int:
+    """
+    补充到 target 条，按块追加（生成时不持锁，不阻塞取题）。返回新增条数。
+    追加前在锁内重新计数：别的进程同时在补时只写还缺的部分。锁长时间被占用就放弃，下次再补。
+    """
+    rnd = random.Random()
+    rec = _record_size(N)
+    added = 0
+    try:
+        while True:
+            with _locked(N, FILL_TIMEOUT) as f:
+                need = min(chunk, target - _count(f, N))
+            if need <= 0:
+                return added
+            blob = b"".join(_make_record(N, rnd) for _ in range(need))
+            with _locked(N, FILL_TIMEOUT) as f:
+                need = min(need, target - _count(f, N))
+                if need <= 0:
+                    return added
+                f.seek(0, os.SEEK_END)
+                f.write(blob[:need * rec])
+            added += need
+    except LeaderboardBusy:
+        return added
+
+def refill_async(N: int, low: int = LOW_WATER, high: int = HIGH_WATER) -> bool:
+    """低于低水位时启动后台线程补充；已在补充或无需补充返回 False。"""
+    with _lock:
+        if N in _refilling:
+            return False
+        _refilling.add(N)
+    try:
+        enough = bank_count(N) >= low
+    except LeaderboardBusy:      # 别的进程正在取题 / 补库，下次开局再看
+        enough = True
+    if enough:
+        with _lock:
+            _refilling.discard(N)
+        return False
+
+    def _run():
+        try:
+            fill_bank(N, high)
+        finally:
+            with _lock:
+                _refilling.discard(N)
+    threading.Thread(target=_run, name=f"bank-refill-{N}", daemon=True).start()
+    return True
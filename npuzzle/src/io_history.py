@@ -0,0 +1,215 @@
+# 完整成绩历史：每个尺寸一个只追加的 JSON-lines 日志 + 内存索引。
+# 排行榜 JSON 仍只存 Top10；这里保留全部成绩，回答名次 / 百分位 / 个人历史。
+import json, os, tempfile
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Tuple
+from io_leaderboard import DATA_DIR, _FileLock, cached_top10
+
+TOP_K = 10
+
+# 记录在内存中的形式：(time_ms, date, user, steps)，按 (time_ms, date) 排序即为排行顺序
+Run = Tuple[int, str, str, int]
+
+def history_path(size: int) -> str:
+    return os.path.join(DATA_DIR, f"history_{size}x{size}.log")
+
+def _as_dict(r: Run) -> dict:
+    return {"user": r[2], "time_ms": r[0], "steps": r[3], "date": r[1]}
+
+def _header() -> str:
+    """日志首行：代号。清空 = 换成新代号的文件，读者据此知道要从头重建。"""
+    return json.dumps({"generation": os.urandom(8).hex()}) + "\n"
+
+def _generation(first_line: bytes) -> Optional[str]:
+    try:
+        return json.loads(first_line).get("generation")
+    except (ValueError, AttributeError):
+        return None
+
+class RunHistory:
+    """
+    一个尺寸的全部成绩：
+    - order：按 (time_ms, date) 排序的时间索引（名次 O(log n)、百分位 O(1)）；
+      新成绩二分后插入列表，插入本身是 O(n) 的内存搬移（100 万条约 0.25ms），不是平衡树；
+    - top：有界 Top-K（前 K 名，O(K) 维护），JsonStore.top10 由它提供；
+    - best_user / by_user：每个用户的最佳时间与历史。
+    日志可能被其他进程追加，refresh() 只读取上次读到的位置之后的新行；
+    首行代号变了（别的进程清空过）就从头重建，解析不了的行跳过。
+    写操作（append / delete / clear）应在排行榜锁内进行，见 JsonStore。
+    """
+    def __init__(self, size: int, top_k: int = TOP_K):
+        self.size = size
+        self.top_k = top_k
+        self.path = history_path(size)
+        if not os.path.exists(self.path):
+            self._seed_from_leaderboard()
+        self._reset()
+
+    def _seed_from_leaderboard(self):
+        """首次启用时用现有 Top10 初始化，保证新旧数据一致。"""
+        os.makedirs(DATA_DIR, exist_ok=True)
+        lines = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in cached_top10(self.size))
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(_header() + lines)
+
+    def _reset(self):
+        self._offset = 0
+        self._gen: Optional[str] = None
+        self.order: List[Run] = []
+        self.top: List[Run] = []
+        self.best_user: Dict[str, int] = {}
+        self.by_user: Dict[str, List[Run]] = {}
+
+    # ---- 索引维护 ----
+    def _add_many(self, runs: List[Run]):
+        """少量新成绩逐条二分插入；大批量（启动时读整个日志）则追加后整体排序。"""
+        if len(runs) > 64:
+            self.order.extend(runs)
+            self.order.sort()
+            self.top = self.order[:self.top_k]
+        else:
+            for r in runs:
+                insort(self.order, r)
+                if len(self.top) < self.top_k or r < self.top[-1]:
+                    insort(self.top, r)
+                    del self.top[self.top_k:]
+        for r in runs:
+            self.by_user.setdefault(r[2], []).append(r)
+            if r[2] not in self.best_user or r[0] < self.best_user[r[2]]:
+                self.best_user[r[2]] = r[0]
+
+    def _remove(self, r: Run):
+        i = bisect_left(self.order, r)
+        if i == len(self.order) or self.order[i] != r:
+            return
+        del self.order[i]
+        if r in self.top:
+            self.top = self.order[:self.top_k]
+        runs = self.by_user.get(r[2], [])
+        runs.remove(r)
+        if runs:
+            self.best_user[r[2]] = min(x[0] for x in runs)
+        else:
+            self.by_user.pop(r[2], None)
+            self.best_user.pop(r[2], None)
+
+    def refresh(self):
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            size = 0
+        if size < self._offset:          # 被清空过：从头重建
+            self._reset()
+        if size == self._offset:
+            return
+        try:
+            with open(self.path, "rb") as f:
+                gen = _generation(f.readline())
+                if gen != self._gen:       # 文件已被换成新一代（清空后又有追加，长度可能反而更大）
+                    self._reset()
+                    self._gen = gen
+                f.seek(self._offset)
+                data = f.read()
+        except FileNotFoundError:
+            self._reset()
+            return
+        end = data.rfind(b"\n") + 1       # 只消费完整的行（别的进程可能正写到一半）
+        pending: List[Run] = []
+        for line in data[:end].splitlines():
+            try:
+                obj = json.loads(line)
+                if "generation" in obj:
+                    continue
+                if "deleted" in obj:
+                    d = obj["deleted"]
+                    run = (d["time_ms"], d["date"], d["user"], d["steps"])
+                    self._add_many(pending)
+                    pending = []
+                    self._remove(run)
+                else:
+                    pending.append((obj["time_ms"], obj["date"], obj["user"], obj["steps"]))
+            except (ValueError, KeyError, TypeError):
+                continue                 # 空行 / 坏行（如崩溃留下的半行）不影响其余记录
+        self._add_many(pending)
+        self._offset += end
+
+    def _append_line(self, obj: dict):
+        # 单次 O_APPEND 写入一整行，多个进程同时追加也不会交错
+        line = (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    # ---- 写 ----
+    def append(self, user: str, time_ms: int, steps: int, date: str, replay: Optional[dict] = None):
+        """replay：开局与走子日志（只落盘，不进内存索引）。"""
+        self._append_line({"user": user, "time_ms": time_ms, "steps": steps, "date": date, **(replay or {})})
+        self.refresh()
+
+    def delete(self, rec: dict):
+        """追加一条删除标记（日志本身不改写）。"""
+        self._append_line({"deleted": {k: rec[k] for k in ("user", "time_ms", "steps", "date")}})
+        self.refresh()
+
+    def clear(self, locked: bool = False):
+        """
+        清空：写一个只有新代号行的临时文件再原子替换，别的进程不会读到截断到一半的日志。
+        locked=True 表示调用方已持有排行榜锁（在 update_lb 的回调里）；否则在这里加锁。
+        """
+        if not locked:
+            with _FileLock():
+                return self.clear(locked=True)
+        fd, tmp = tempfile.mkstemp(prefix=".history-", suffix=".tmp", dir=DATA_DIR)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(_header())
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        self._reset()
+        self.refresh()
+
+    # ---- 查询 ----
+    def count(self) -> int:
+        self.refresh()
+        return len(self.order)
+
+    def top10(self) -> List[dict]:
+        self.refresh()
+        return [_as_dict(r) for r in self.top[:10]]
+
+    def best_time_ms_user(self, user: str) -> Optional[int]:
+        self.refresh()
+        return self.best_user.get((user or "").strip())
+
+    def rank_of(self, time_ms: int) -> int:
+        """若现在提交 time_ms，会排第几名（1 起；同时间排在已有记录之后）。"""
+        self.refresh()
+        return bisect_right(self.order, time_ms, key=lambda r: r[0]) + 1
+
+    def percentile(self, q: float) -> Optional[int]:
+        """第 q 分位（0~1）的时间；无记录返回 None。"""
+        self.refresh()
+        if not self.order:
+            return None
+        q = min(1.0, max(0.0, q))
+        return self.order[int(round(q * (len(self.order) - 1)))][0]
+
+    def user_history(self, user: str) -> List[dict]:
+        """该用户的全部成绩（按提交顺序）。"""
+        self.refresh()
+        return [_as_dict(r) for r in self.by_user.get((user or "").strip(), [])]
+
+_histories: Dict[int, RunHistory] = {}
+
+def history(size: int) -> RunHistory:
+    h = _histories.get(size)
+    if h is None or h.path != history_path(size):
+        h = _histories[size] = RunHistory(size)
+    return h
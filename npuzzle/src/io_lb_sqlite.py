@@ -0,0 +1,190 @@
+# 排行榜 SQLite 后端：WAL 模式，按 (size, time_ms) 和 (size, user) 建索引。
+# 每次成绩只插一行；Top10 / 个人最佳都是走索引的查询。
+import base64, json, os, sqlite3
+from functools import wraps
+from typing import List, Optional
+from io_leaderboard import DATA_DIR, PATH as JSON_PATH, LeaderboardBusy, _now_str
+
+DB_PATH = os.path.join(DATA_DIR, "leaderboard.sqlite3")
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id      INTEGER PRIMARY KEY,
+    size    INTEGER NOT NULL,
+    user    TEXT    NOT NULL,
+    time_ms INTEGER NOT NULL,
+    steps   INTEGER NOT NULL,
+    date    TEXT    NOT NULL,
+    start   BLOB,
+    journal BLOB
+);
+CREATE INDEX IF NOT EXISTS runs_size_time ON runs(size, time_ms, date);
+CREATE INDEX IF NOT EXISTS runs_size_user ON runs(size, user, time_ms);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS run_counts (size INTEGER PRIMARY KEY, n INTEGER NOT NULL);
+CREATE TRIGGER IF NOT EXISTS runs_count_ins AFTER INSERT ON runs BEGIN
+    INSERT INTO run_counts(size, n) VALUES (NEW.size, 1) ON CONFLICT(size) DO UPDATE SET n = n + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS runs_count_del AFTER DELETE ON runs BEGIN
+    UPDATE run_counts SET n = n - 1 WHERE size = OLD.size;
+END;
+"""
+
+_ORDER = "ORDER BY time_ms, date, id"   # 与 JSON 版排序一致：时间升序，同时间按日期先后
+
+def _busy_as_exception(fn):
+    """写冲突时 SQLite 只等 busy_timeout；超时转成 LeaderboardBusy，由调用方稍后重试。"""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        except sqlite3.OperationalError as e:
+            if "locked" in str(e) or "busy" in str(e):
+                raise LeaderboardBusy(str(e)) from e
+            raise
+    return wrapper
+
+class SqliteStore:
+    def __init__(self, path: str = DB_PATH, json_path: str = JSON_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("PRAGMA busy_timeout=2000")  # 建表/迁移只在启动时发生，可以多等一会
+        self.db.executescript(_SCHEMA)
+        self._add_replay_columns()
+        self._migrate_json(json_path)
+        self._backfill_counts()
+        self.db.execute("PRAGMA busy_timeout=50")    # 之后的写入只短等，不拖住 Tk 线程
+
+    def _add_replay_columns(self):
+        """旧库没有 start / journal 列时补上（旧记录为 NULL）。"""
+        cols = {row[1] for row in self.db.execute("PRAGMA table_info(runs)")}
+        for col in ("start", "journal"):
+            if col not in cols:
+                try:
+                    self.db.execute(f"ALTER TABLE runs ADD COLUMN {col} BLOB")
+                except sqlite3.OperationalError as e:   # 另一进程刚加过
+                    if "duplicate column" not in str(e):
+                        raise
+
+    def _migrate_json(self, json_path: str):
+        """首次运行：把 leaderboard.json 的记录导入（JSON 文件保留不动，作为备份）。"""
+        cur = self.db.execute("SELECT value FROM meta WHERE key='schema_version'")
+        if cur.fetchone() is not None:
+            return
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            if self.db.execute("SELECT value FROM meta WHERE key='schema_version'").fetchone() is None:
+                if os.path.exists(json_path):
+                    with open(json_path, "r", encoding="utf-8") as f:
+                        lb = json.load(f)
+                    rows = [(int(size), r["user"], r["time_ms"], r["steps"], r.get("date") or _now_str(),
+                             bytes(r["start"]) if "start" in r else None,
+                             base64.b64decode(r["journal"]) if "journal" in r else None)
+                            for size, v in lb.items() for r in v.get("records_time", [])]
+                    self.db.executemany("INSERT INTO runs(size, user, time_ms, steps, date, start, journal) "
+                                        "VALUES (?,?,?,?,?,?,?)", rows)
+                self.db.execute("INSERT INTO meta(key, value) VALUES ('schema_version', ?)",
+                                (str(SCHEMA_VERSION),))
+            self.db.execute("COMMIT")
+        except Exception:
+            self.db.execute("ROLLBACK")
+            raise
+
+    def _backfill_counts(self):
+        """触发器建好之前已有的记录：按尺寸补一次人数（只做一次，之后由触发器维护）。"""
+        if self.db.execute("SELECT 1 FROM meta WHERE key='run_counts'").fetchone() is not None:
+            return
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            if self.db.execute("SELECT 1 FROM meta WHERE key='run_counts'").fetchone() is None:
+                self.db.execute("DELETE FROM run_counts")
+                self.db.execute("INSERT INTO run_counts(size, n) SELECT size, COUNT(*) FROM runs GROUP BY size")
+                self.db.execute("INSERT INTO meta(key, value) VALUES ('run_counts', '1')")
+            self.db.execute("COMMIT")
+        except Exception:
+            self.db.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _rows(cur) -> List[dict]:
+        return [{"user": u, "time_ms": t, "steps": s, "date": d} for u, t, s, d in cur]
+
+    # ---- 与 io_leaderboard.JsonStore 相同的接口 ----
+    @_busy_as_exception
+    def submit_record(self, size: int, user: str, time_ms: int, steps: int,
+                      start: Optional[List[int]] = None, journal: Optional[bytes] = None):
+        """start / journal：开局盘面与走子日志（core_journal），用于核对与重放。"""
+        self.db.execute("INSERT INTO runs(size, user, time_ms, steps, date, start, journal) VALUES (?,?,?,?,?,?,?)",
+                        (size, user, time_ms, steps, _now_str(),
+                         None if start is None else bytes(start), journal))
+
+    def top10(self, size: int) -> List[dict]:
+        return self._rows(self.db.execute(
+            f"SELECT user, time_ms, steps, date FROM runs WHERE size=? {_ORDER} LIMIT 10", (size,)))
+
+    def best_time_ms(self, size: int) -> Optional[int]:
+        row = self.db.execute("SELECT MIN(time_ms) FROM runs WHERE size=?", (size,)).fetchone()
+        return row[0]
+
+    def best_time_ms_user(self, size: int, user: str) -> Optional[int]:
+        u = (user or "").strip()
+        if not u:
+            return None
+        row = self.db.execute("SELECT MIN(time_ms) FROM runs WHERE size=? AND user=?", (size, u)).fetchone()
+        return row[0]
+
+    def rank_of(self, size: int, time_ms: int) -> int:
+        """若现在提交 time_ms 会排第几名（1 起）；走 (size, time_ms) 索引的范围计数。"""
+        row = self.db.execute("SELECT COUNT(*) FROM runs WHERE size=? AND time_ms<=?", (size, time_ms)).fetchone()
+        return row[0] + 1
+
+    def percentile(self, size: int, q: float) -> Optional[int]:
+        """
+        人数取自触发器维护的 run_counts（O(1)）；定位第 k 名仍要沿 (size, time_ms) 索引跳过 k 项，
+        是 O(k) 的（SQLite 没有按名次取行的索引；100 万条时约 30~50ms）。
+        """
+        row = self.db.execute("SELECT n FROM run_counts WHERE size=?", (size,)).fetchone()
+        n = row[0] if row else 0
+        if n == 0:
+            return None
+        q = min(1.0, max(0.0, q))
+        row = self.db.execute("SELECT time_ms FROM runs WHERE size=? ORDER BY time_ms LIMIT 1 OFFSET ?",
+                              (size, int(round(q * (n - 1))))).fetchone()
+        return row[0]
+
+    def user_history(self, size: int, user: str) -> List[dict]:
+        return self._rows(self.db.execute(
+            "SELECT user, time_ms, steps, date FROM runs WHERE size=? AND user=? ORDER BY id",
+            (size, (user or "").strip())))
+
+    @_busy_as_exception
+    def clear_level(self, size: int):
+        self.db.execute("DELETE FROM runs WHERE size=?", (size,))
+
+    @_busy_as_exception
+    def clear_all(self):
+        self.db.execute("DELETE FROM runs")
+
+    @_busy_as_exception
+    def delete_record(self, size: int, idx: int) -> bool:
+        """删除 Top10 视图中的第 idx 条（0 起）；视图外的下标无效，与 JsonStore 一致。"""
+        if not 0 <= idx < 10:
+            return False
+        self.db.execute("BEGIN IMMEDIATE")   # 查 id 与删除在同一事务内，防止并发删错行
+        try:
+            row = self.db.execute(f"SELECT id FROM runs WHERE size=? {_ORDER} LIMIT 1 OFFSET ?",
+                                  (size, idx)).fetchone()
+            if row is not None:
+                self.db.execute("DELETE FROM runs WHERE id=?", (row[0],))
+            self.db.execute("COMMIT")
+        except Exception:
+            self.db.execute("ROLLBACK")
+            raise
+        return row is not None
+
+    def close(self):
+        self.db.close()
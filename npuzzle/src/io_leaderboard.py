@@ -1,41 +1,166 @@
-import json, os, datetime
-from typing import Dict, List
+import base64, json, os, datetime, tempfile, time
+from typing import Callable, Dict, List
+
+try:                      # POSIX
+    import fcntl
+except ImportError:       # Windows
+    fcntl = None
+    import msvcrt
 
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
 PATH = os.path.join(DATA_DIR, "leaderboard.json")
 
+class LeaderboardBusy(Exception):
+    """另一个进程正持有排行榜锁；调用方稍后重试即可（不要在 Tk 线程里死等）。"""
+
 def _empty_lb() -> Dict:
     return {"3":{"records_time":[]}, "4":{"records_time":[]}, "5":{"records_time":[]}}
 
+# === 进程内缓存 ===
+# 保存解析后的排行榜和文件签名 (mtime_ns, size, inode)；签名不变就不再读盘。
+# 自己写入时直接更新缓存（write-through），并预先算好每个尺寸的最佳时间。
+# JsonStore.top10 / best_time_ms 直接读这里，不用每次刷新历史日志。
+_cache: Dict = {"sig": None, "lb": None, "best": {}}
+
+def _copy_lb(lb: Dict) -> Dict:
+    """按排行榜结构复制（记录都是扁平 dict），比 deepcopy 快得多。"""
+    return {k: ({kk: ([dict(r) for r in vv] if isinstance(vv, list) else vv) for kk, vv in v.items()}
+                if isinstance(v, dict) else v)
+            for k, v in lb.items()}
+
+def _file_sig():
+    st = os.stat(PATH)
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+def _set_cache(lb: Dict, sig):
+    best: Dict[str, int] = {}
+    for key, v in lb.items():
+        if not isinstance(v, dict):
+            continue
+        for r in v.get("records_time", []):
+            t = r.get("time_ms")
+            if isinstance(t, int) and (key not in best or t < best[key]):
+                best[key] = t
+    _cache.update(sig=sig, lb=lb, best=best)
+
+def _cached_lb() -> Dict:
+    """缓存中的排行榜（只读，不要修改）；文件被别的进程改过才重新解析。"""
+    _ensure()
+    sig = _file_sig()
+    if _cache["sig"] != sig:
+        with open(PATH, "r", encoding="utf-8") as f:
+            _set_cache(json.load(f), sig)
+    return _cache["lb"]
+
+def _atomic_write(lb: Dict, indent: int | None = None):
+    """先写同目录临时文件并 fsync，再 os.replace，崩溃时不会留下半个文件。"""
+    fd, tmp = tempfile.mkstemp(prefix=".leaderboard-", suffix=".tmp", dir=DATA_DIR)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(lb, f, ensure_ascii=False, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, PATH)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
 def _ensure():
     os.makedirs(DATA_DIR, exist_ok=True)
     if not os.path.exists(PATH):
-        with open(PATH, "w", encoding="utf-8") as f:
-            json.dump(_empty_lb(), f)
+        _atomic_write(_empty_lb())
+
+class _FileLock:
+    """
+    跨进程建议锁（锁的是旁边的 .lock 文件，不是数据文件本身；默认锁排行榜，题库等传入自己的 path）。
+    非阻塞地短间隔重试，超过 timeout 秒抛 LeaderboardBusy。
+    """
+    def __init__(self, timeout: float = 0.05, interval: float = 0.005, path: str | None = None):
+        self.timeout = timeout
+        self.interval = interval
+        self.path = path or PATH + ".lock"
+        self._f = None
+
+    def _try_lock(self) -> bool:
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                self._f.seek(0)
+                msvcrt.locking(self._f.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def __enter__(self):
+        os.makedirs(DATA_DIR, exist_ok=True)
+        self._f = open(self.path, "a+b")
+        deadline = time.monotonic() + self.timeout
+        while not self._try_lock():
+            if time.monotonic() >= deadline:
+                self._f.close()
+                self._f = None
+                raise LeaderboardBusy(self.path)
+            time.sleep(self.interval)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self._f.fileno(), fcntl.LOCK_UN)
+        else:
+            self._f.seek(0)
+            msvcrt.locking(self._f.fileno(), msvcrt.LK_UNLCK, 1)
+        self._f.close()
+        self._f = None
 
 def load_lb() -> Dict:
-    _ensure()
-    with open(PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
+    """返回一份可随意修改的副本；未变化的文件不会重复读盘解析。"""
+    return _copy_lb(_cached_lb())
 
 def save_lb(lb: Dict):
     _ensure()
-    with open(PATH, "w", encoding="utf-8") as f:
-        json.dump(lb, f, ensure_ascii=False, indent=2)
+    _atomic_write(lb, indent=2)
+    _set_cache(_copy_lb(lb), _file_sig())
+
+def cached_top10(size: int) -> List[dict]:
+    return [dict(r) for r in top10(_cached_lb(), size)]
+
+def cached_best_time_ms(size: int) -> int | None:
+    _cached_lb()
+    return _cache["best"].get(str(size))
+
+def update_lb(fn: Callable[[Dict], object], timeout: float = 0.05):
+    """加锁的「读-改-写」：fn(lb) 原地修改并返回结果；拿不到锁抛 LeaderboardBusy。"""
+    with _FileLock(timeout):
+        lb = load_lb()
+        result = fn(lb)
+        save_lb(lb)
+        return result
+
+def replay_fields(start: List[int] | None, journal: bytes | None) -> Dict:
+    """记录里的重放信息：开局盘面 + base64 编码的走子日志（见 core_journal）。"""
+    if start is None or journal is None:
+        return {}
+    return {"start": list(start), "journal": base64.b64encode(journal).decode("ascii")}
 
 def _now_str() -> str:
     # 24h 制，仅到秒：YYYY-MM-DD HH:MM:SS
     return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-def submit_record(lb: Dict, size: int, user: str, time_ms: int, steps: int):
-    """写入一条记录并保持 Top10（按 time_ms 升序；时间相同按日期先后）"""
+def submit_record(lb: Dict, size: int, user: str, time_ms: int, steps: int, date: str | None = None,
+                  replay: Dict | None = None):
+    """写入一条记录并保持 Top10（按 time_ms 升序；时间相同按日期先后）；replay 为可选的开局 + 走子日志"""
     key = str(size)
     lb.setdefault(key, {"records_time":[]})
     lb[key]["records_time"].append({
         "user": user,
         "time_ms": time_ms,
         "steps": steps,
-        "date": _now_str()
+        "date": date or _now_str(),
+        **(replay or {})
     })
     lb[key]["records_time"].sort(key=lambda r:(r["time_ms"], r["date"]))
     lb[key]["records_time"] = lb[key]["records_time"][:10]
@@ -82,3 +207,91 @@ def delete_record(lb: Dict, size: int, idx: int) -> bool:
         arr.pop(idx)
         return True
     return False
+
+# === 存储后端 ===
+# 默认 SQLite（见 io_lb_sqlite.py，首次运行自动导入 leaderboard.json）；
+# 设环境变量 NPUZZLE_LB_BACKEND=json 可继续使用整文件 JSON。
+
+class JsonStore:
+    """
+    整文件 JSON 实现，接口与 SqliteStore 相同；写操作都在跨进程锁内完成。
+    JSON 只存 Top10（读进程内缓存）；全部成绩另记在 io_history 的只追加日志里，
+    个人最佳、名次、百分位以它为准，删除时 Top10 也按它重排。
+    """
+    def submit_record(self, size: int, user: str, time_ms: int, steps: int,
+                      start: List[int] | None = None, journal: bytes | None = None):
+        from io_history import history
+        h = history(size)        # 先建好（首次会用当前 Top10 初始化），再写入，避免同一条记两次
+        date = _now_str()
+        replay = replay_fields(start, journal)
+        def _submit(lb):          # 历史日志也在锁内追加，不会与别的进程的清空交错
+            submit_record(lb, size, user, time_ms, steps, date, replay)
+            h.append(user, time_ms, steps, date, replay)
+        update_lb(_submit)
+
+    def top10(self, size: int) -> List[dict]:
+        return cached_top10(size)
+
+    def best_time_ms(self, size: int):
+        return cached_best_time_ms(size)
+
+    def best_time_ms_user(self, size: int, user: str) -> int | None:
+        from io_history import history
+        return history(size).best_time_ms_user(user)
+
+    def rank_of(self, size: int, time_ms: int) -> int:
+        from io_history import history
+        return history(size).rank_of(time_ms)
+
+    def percentile(self, size: int, q: float) -> int | None:
+        from io_history import history
+        return history(size).percentile(q)
+
+    def user_history(self, size: int, user: str) -> List[dict]:
+        from io_history import history
+        return history(size).user_history(user)
+
+    def clear_level(self, size: int):
+        from io_history import history
+        h = history(size)
+        def _clear(lb):
+            clear_level(lb, size)
+            h.clear(locked=True)
+        update_lb(_clear)
+
+    def clear_all(self):
+        from io_history import history
+        def _clear(lb):
+            sizes = [int(k) for k in lb]
+            clear_all(lb)
+            for size in sizes:
+                history(size).clear(locked=True)
+        update_lb(_clear)
+
+    def delete_record(self, size: int, idx: int) -> bool:
+        """删除 top10() 视图中的第 idx 条；JSON 里的 Top10 随后按历史重排，第 11 名补上来。"""
+        from io_history import history
+        h = history(size)
+        fields = lambda r: (r["user"], r["time_ms"], r["steps"], r["date"])
+        def _pop(lb):
+            view = top10(lb, size)   # 与 top10() 同一份数据；在锁内取视图并删除，别的进程插不进来
+            if not 0 <= idx < len(view):
+                return False
+            h.delete(view[idx])
+            old = {fields(r): r for r in top10(lb, size)}     # 已有记录保留重放字段
+            lb.setdefault(str(size), {})["records_time"] = [old.get(fields(r), r) for r in h.top10()]
+            return True
+        return update_lb(_pop)
+
+_store = None
+
+def get_store():
+    """进程内单例；后端由 NPUZZLE_LB_BACKEND 决定（sqlite / json）。"""
+    global _store
+    if _store is None:
+        if os.environ.get("NPUZZLE_LB_BACKEND", "sqlite").lower() == "json":
+            _store = JsonStore()
+        else:
+            from io_lb_sqlite import SqliteStore
+            _store = SqliteStore()
+    return _store
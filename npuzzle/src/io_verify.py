@@ -0,0 +1,169 @@
+# 成绩核对：用记录里的开局 + 走子日志（core_journal）重放，检查是否真的走到目标、步数是否与 steps 一致。
+#
+#   python io_verify.py                        # 当前后端（NPUZZLE_LB_BACKEND）的全部成绩
+#   python io_verify.py --since 2026-10-18     # 只查某天以来
+#   python io_verify.py --backend json         # 查 data/history_NxN.log
+#   python io_verify.py --cross-check          # 自检：NumPy 批量与逐局重放的结论逐条对比
+#
+# 有问题的成绩每行输出一个 JSON；装有 NumPy 时按尺寸成批向量化重放（core_batch），否则逐局重放。
+import argparse, base64, glob, json, os, re, sqlite3, sys
+from typing import Dict, Iterator, List, Optional, Tuple
+import core_batch
+from core_journal import journal_moves, replay
+from io_leaderboard import DATA_DIR
+
+CHUNK = 4096          # 每批重放的局数（控制内存）
+
+def runs_from_history(since: Optional[str] = None) -> Iterator[dict]:
+    """JSON 后端：读各尺寸的完整历史日志，跳过已被删除标记抵消的成绩。"""
+    for path in sorted(glob.glob(os.path.join(DATA_DIR, "history_*x*.log"))):
+        size = int(re.search(r"history_(\d+)x", os.path.basename(path)).group(1))
+        with open(path, "r", encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        deleted: Dict[tuple, int] = {}
+        for obj in lines:
+            if "deleted" in obj:
+                d = obj["deleted"]
+                key = (d["user"], d["time_ms"], d["steps"], d["date"])
+                deleted[key] = deleted.get(key, 0) + 1
+        for no, obj in enumerate(lines, start=1):
+            if "deleted" in obj or (since and obj["date"] < since):
+                continue
+            key = (obj["user"], obj["time_ms"], obj["steps"], obj["date"])
+            if deleted.get(key):
+                deleted[key] -= 1
+                continue
+            journal = obj.get("journal")
+            yield {"ref": f"{os.path.basename(path)}:{no}", "size": size, "user": obj["user"],
+                   "time_ms": obj["time_ms"], "steps": obj["steps"], "date": obj["date"],
+                   "start": obj.get("start"), "journal": base64.b64decode(journal) if journal else None}
+
+def runs_from_sqlite(path: str, since: Optional[str] = None) -> Iterator[dict]:
+    """SQLite 后端：只读打开，不触发建表 / 迁移。"""
+    db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        cur = db.execute("SELECT id, size, user, time_ms, steps, date, start, journal FROM runs "
+                         "WHERE date >= ? ORDER BY id", (since or "",))
+        for rid, size, user, time_ms, steps, date, start, journal in cur:
+            yield {"ref": f"runs.id={rid}", "size": size, "user": user, "time_ms": time_ms, "steps": steps,
+                   "date": date, "start": None if start is None else list(start), "journal": journal}
+    finally:
+        db.close()
+
+def _problem(run: dict, reason: str) -> dict:
+    return {k: run[k] for k in ("ref", "size", "user", "time_ms", "steps", "date")} | {"reason": reason}
+
+def _decode(run: dict) -> bytes:
+    """点击序列；日志损坏时抛 ValueError。"""
+    N = run["size"]
+    start = run["start"]
+    if len(start) != N*N or sorted(start) != list(range(N*N)):
+        raise ValueError("bad start state")
+    try:
+        return journal_moves(run["journal"], N*N)
+    except ValueError:
+        raise ValueError("corrupt journal")
+
+def _check_batch(N: int, runs: List[dict], moves: List[bytes]) -> List[dict]:
+    np = core_batch.np
+    final, ok = core_batch.replay_batch(np.array([r["start"] for r in runs], dtype=np.uint8),
+                                        core_batch.pad_moves(moves, N), N)
+    solved = core_batch.goal_mask(final, N)
+    out = []
+    for run, m, good, done in zip(runs, moves, ok.tolist(), solved.tolist()):
+        if not good:
+            out.append(_problem(run, "invalid move"))
+        elif not done:
+            out.append(_problem(run, "not solved"))
+        elif len(m) != run["steps"]:
+            out.append(_problem(run, f"steps mismatch: journal has {len(m)}"))
+    return out
+
+def _check_one(N: int, run: dict, m: bytes) -> Optional[dict]:
+    try:
+        final = replay(run["start"], N, m)
+    except ValueError:
+        return _problem(run, "invalid move")
+    if final != list(range(1, N*N)) + [0]:
+        return _problem(run, "not solved")
+    if len(m) != run["steps"]:
+        return _problem(run, f"steps mismatch: journal has {len(m)}")
+    return None
+
+def verify_runs(runs, use_numpy: bool = True) -> Tuple[List[dict], int, int]:
+    """返回 (问题列表, 核对局数, 因没有走子日志而跳过的局数)。"""
+    batch = use_numpy and core_batch.available()
+    problems: List[dict] = []
+    pending: Dict[int, Tuple[List[dict], List[bytes]]] = {}
+    checked = skipped = 0
+
+    def _flush(N: int):
+        rs, ms = pending.pop(N)
+        problems.extend(_check_batch(N, rs, ms))
+
+    for run in runs:
+        if run["start"] is None or run["journal"] is None:
+            skipped += 1        # 加入日志功能之前的旧成绩
+            continue
+        checked += 1
+        N = run["size"]
+        try:
+            m = _decode(run)
+        except ValueError as e:
+            problems.append(_problem(run, str(e)))
+            continue
+        if not batch:
+            p = _check_one(N, run, m)
+            if p is not None:
+                problems.append(p)
+            continue
+        rs, ms = pending.setdefault(N, ([], []))
+        rs.append(run)
+        ms.append(m)
+        if len(rs) >= CHUNK:
+            _flush(N)
+    for N in list(pending):
+        _flush(N)
+    return problems, checked, skipped
+
+def cross_check(runs) -> List[dict]:
+    """两条路径各核对一遍，返回结论不一致的成绩（reason 里写明两边的结论）。需要 NumPy。"""
+    runs = list(runs)
+    fast = {p["ref"]: p["reason"] for p in verify_runs(runs, use_numpy=True)[0]}
+    slow = {p["ref"]: p["reason"] for p in verify_runs(runs, use_numpy=False)[0]}
+    return [_problem(r, f"numpy: {fast.get(r['ref'], 'ok')}; python: {slow.get(r['ref'], 'ok')}")
+            for r in runs if fast.get(r["ref"]) != slow.get(r["ref"])]
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Verify recorded n-Puzzle runs by replaying their move journals.")
+    ap.add_argument("--backend", choices=("sqlite", "json"),
+                    default=os.environ.get("NPUZZLE_LB_BACKEND", "sqlite").lower())
+    ap.add_argument("--db", default=None, help="SQLite file (default: data/leaderboard.sqlite3)")
+    ap.add_argument("--since", default=None, help='only runs on or after this date, e.g. "2026-10-18"')
+    ap.add_argument("--no-numpy", action="store_true", help="replay one run at a time in pure Python")
+    ap.add_argument("--cross-check", action="store_true",
+                    help="replay with both NumPy and pure Python and report runs where the verdicts differ")
+    args = ap.parse_args(argv)
+    if args.cross_check and not core_batch.available():
+        print("--cross-check needs NumPy", file=sys.stderr)
+        return 2
+
+    if args.backend == "json":
+        runs = runs_from_history(args.since)
+    else:
+        from io_lb_sqlite import DB_PATH
+        runs = runs_from_sqlite(args.db or DB_PATH, args.since)
+    if args.cross_check:
+        diffs = cross_check(runs)
+        for p in diffs:
+            sys.stdout.write(json.dumps(p, ensure_ascii=False) + "\n")
+        print(f"{len(diffs)} runs with differing verdicts", file=sys.stderr)
+        return 1 if diffs else 0
+    problems, checked, skipped = verify_runs(runs, use_numpy=not args.no_numpy)
+    for p in problems:
+        sys.stdout.write(json.dumps(p, ensure_ascii=False) + "\n")
+    print(f"checked {checked} runs, {len(problems)} flagged, {skipped} without journal", file=sys.stderr)
+    return 1 if problems else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+# 棋盘绘制：网格与方块只创建一次，之后每次段滑动只移动被滑动的那一段方块。
+import tkinter as tk
+from typing import Dict, List, Optional, Sequence, Tuple
+
+class BoardRenderer:
+    """
+    在 canvas 上维护 N×N 棋盘：
+    - 每个块一个矩形 + 一个文字，共用标签 "t<值>"，canvas.move 一次移动两者；
+    - cells[i] 是当前画在第 i 格的块（0 为空格），与 Board.state 同步；
+    - slide(k) 代价与段长度成正比；draw(state) 用于新局 / 重置等整盘变化。
+    anim_ms > 0 时滑动以 frame_ms 为一帧做补间，上一段动画没结束就来新移动时直接跳到终点。
+    """
+    def __init__(self, canvas: tk.Canvas, N: int, cell: int, pad: int,
+                 anim_ms: int = 0, frame_ms: int = 16):
+        self.canvas = canvas
+        self.N = N
+        self.cell = cell
+        self.pad = pad
+        self.frames = max(1, anim_ms // frame_ms) if anim_ms > 0 else 0
+        self.frame_ms = frame_ms
+        self.cells: List[int] = []
+        self.blank = -1
+        self._items: Dict[int, Tuple[int, int]] = {}           # 块值 -> (矩形, 文字)
+        self._anim: List[Tuple[int, int, float, float]] = []   # 动画中的块：(值, 目标格, 每帧 dx, dy)
+        self._anim_left = 0
+        self._after: Optional[str] = None
+        self._create()
+        canvas.bind("<Destroy>", lambda _e: self._cancel(), add="+")
+
+    # ---------------- 坐标 ----------------
+    def _rect(self, i: int) -> Tuple[int, int, int, int]:
+        r, c = divmod(i, self.N)
+        x0, y0 = self.pad + c * self.cell, self.pad + r * self.cell
+        return x0 + 2, y0 + 2, x0 + self.cell - 2, y0 + self.cell - 2
+
+    def _center(self, i: int) -> Tuple[int, int]:
+        r, c = divmod(i, self.N)
+        return self.pad + c * self.cell + self.cell // 2, self.pad + r * self.cell + self.cell // 2
+
+    def _place(self, v: int, i: int):
+        rect, text = self._items[v]
+        self.canvas.coords(rect, *self._rect(i))
+        self.canvas.coords(text, *self._center(i))
+
+    # ---------------- 创建 / 整盘同步 ----------------
+    def _create(self):
+        N, CELL, PAD = self.N, self.cell, self.pad
+        cv = self.canvas
+        cv.delete("all")
+        for r in range(N + 1):
+            y = PAD + r * CELL
+            cv.create_line(PAD, y, PAD + N * CELL, y, fill="#ddd")
+        for c in range(N + 1):
+            x = PAD + c * CELL
+            cv.create_line(x, PAD, x, PAD + N * CELL, fill="#ddd")
+        font = ("Arial", max(9, CELL // 5), "bold")
+        for v in range(1, N * N):
+            tag = f"t{v}"
+            rect = cv.create_rectangle(0, 0, 0, 0, fill="#ffffff", outline="#333", width=2, tags=tag)
+            text = cv.create_text(0, 0, text=str(v), font=font, tags=tag)
+            self._items[v] = (rect, text)
+
+    def draw(self, state: Sequence[int]):
+        """整盘同步：只重新定位位置变了的块。"""
+        self._finish()
+        old = self.cells
+        for i, v in enumerate(state):
+            if v and (len(old) != len(state) or old[i] != v):
+                self._place(v, i)
+        self.cells = list(state)
+        self.blank = self.cells.index(0)
+
+    # ---------------- 段滑动 ----------------
+    def slide(self, k: int):
+        """与 Board.segment_move_if_valid(k) 对应：空格与 k 之间的块朝空格方向移动一格。"""
+        self._finish()
+        N, b, cells = self.N, self.blank, self.cells
+        step = 1 if k // N == b // N else N
+        d = step if k < b else -step               # 被滑动的块移动方向（下标增量）
+        dx, dy = (d * self.cell, 0) if step == 1 else (0, (d // N) * self.cell)
+        moved = []
+        for i in range(b, k, -d):                  # 目标格：b, b-d, ..., k+d
+            v = cells[i] = cells[i - d]
+            moved.append((v, i))
+        cells[k] = 0
+        self.blank = k
+        if not self.frames:
+            for v, _ in moved:
+                self.canvas.move(f"t{v}", dx, dy)
+            return
+        self._anim = [(v, i, dx / self.frames, dy / self.frames) for v, i in moved]
+        self._anim_left = self.frames
+        self._frame()
+
+    def _frame(self):
+        self._after = None
+        for v, _, fx, fy in self._anim:
+            self.canvas.move(f"t{v}", fx, fy)
+        self._anim_left -= 1
+        if self._anim_left > 0:
+            self._after = self.canvas.after(self.frame_ms, self._frame)
+        else:
+            self._settle()
+
+    def _settle(self):
+        # 浮点补间可能有累计误差，结束时按格子坐标对齐
+        for v, i, _, _ in self._anim:
+            self._place(v, i)
+        self._anim = []
+
+    def _finish(self):
+        """立刻结束进行中的动画（跳到终点）。"""
+        if self._anim:
+            self._cancel()
+            self._settle()
+
+    def _cancel(self):
+        if self._after is not None:
+            self.canvas.after_cancel(self._after)
+            self._after = None
@@ -1,17 +1,26 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from core_board import Board
-from core_scramble import scramble_from_goal
+from core_scramble import random_solvable
 from core_timer import GameTimer
-from io_leaderboard import load_lb, save_lb, submit_record, best_time_ms, best_time_ms_user
+from ui_board import BoardRenderer
+from ui_scheduler import Scheduler
+from io_bank import pop_puzzle, refill_async
+from io_leaderboard import get_store, LeaderboardBusy
+from hint.hint_cache import MISS, hint_cache
+from hint.hint_plan import Planner
+from hint.hint_worker import HintWorker
 
 class GameView(ttk.Frame):
     CELL, PAD = 80, 20
+    BOARD_PX = 440   # 棋盘（含边距）最大边长：固定 640×640 窗口内放得下其余控件；大棋盘按此缩小格子
+    ANIM_MS = 90   # 段滑动动画时长（毫秒），0 为关闭
 
-    def __init__(self, master, user: str, size: int, on_back_home, on_success):
+    def __init__(self, master, user: str, size: int, on_back_home, on_success, scheduler: Scheduler):
         super().__init__(master)
         self.user = user
         self.size = size
+        self.cell = min(self.CELL, (self.BOARD_PX - 2 * self.PAD) // size)
         self.on_back_home = on_back_home
         self.on_success = on_success  # 跳转成功页
 
@@ -22,10 +31,18 @@ class GameView(ttk.Frame):
         self.board = Board(size, goal)
         self.board.start = self.board.state[:]  # 仅为 reset 安全
         self.timer = GameTimer()                # 未 start，计时显示 00:00
+        # 后台 Hint：预览期间就开始导入模块、加载表
+        self.hints = HintWorker(size)
+        self.planner = Planner(size)   # 整局解路径：沿着走时 Hint 直接查表
+        self._hint_wanted = False
+        self.bind("<Destroy>", self._on_destroy)
 
         self._build_ui()
         self._draw_board()
-        self._tick()
+        # 计时显示只在秒数跳变时刷新，计时停止后休眠；Hint 轮询只在等待结果时运行
+        self._shown_time = None
+        self._tick_job = scheduler.every(self, self._tick)
+        self._hint_job = scheduler.every(self, self._poll_hint)
 
     # ---------------- UI layout ----------------
     def _build_ui(self):
@@ -56,11 +73,12 @@ class GameView(ttk.Frame):
         row2.grid_columnconfigure(2, weight=0)
 
         # —— 画布保持不变 ——
-        w = self.size * self.CELL + 2 * self.PAD
-        h = self.size * self.CELL + 2 * self.PAD
+        w = self.size * self.cell + 2 * self.PAD
+        h = self.size * self.cell + 2 * self.PAD
         self.canvas = tk.Canvas(self, width=w, height=h, bg="#f7f7f7", highlightthickness=0)
         self.canvas.pack(padx=10, pady=(10, 4))
         self.canvas.bind("<Button-1>", self._on_click)
+        self.renderer = BoardRenderer(self.canvas, self.size, self.cell, self.PAD, anim_ms=self.ANIM_MS)
 
         # —— 预览提示 —— 
         self.lbl_preview_hint = ttk.Label(self, text="Target pattern")
@@ -80,59 +98,56 @@ class GameView(ttk.Frame):
             ttk.Button(self.bottom, text="Confirm", command=self._confirm_and_start).pack(side="right")
         else:
             ttk.Button(self.bottom, text="Reset", command=self._reset).pack(side="left")
-            if self.size == 3:
-                ttk.Button(self.bottom, text="Hint", command=self._hint_3x3).pack(side="right")
+            ttk.Button(self.bottom, text="Undo", command=self._undo).pack(side="left", padx=(6, 0))
+            ttk.Button(self.bottom, text="Redo", command=self._redo).pack(side="left", padx=(6, 0))
+            ttk.Button(self.bottom, text="Hint", command=self._hint).pack(side="right")
             # ★ 管理员专属按钮
             if self.user == "admin":
                 ttk.Button(self.bottom, text="Restore", command=self._admin_restore).pack(side="right", padx=6)
 
     # ---------------- drawing ----------------
     def _draw_board(self):
-        N, CELL, PAD = self.size, self.CELL, self.PAD
-        s = self.board.state
-        self.canvas.delete("all")
-        for r in range(N + 1):
-            y = PAD + r * CELL
-            self.canvas.create_line(PAD, y, PAD + N * CELL, y, fill="#ddd")
-        for c in range(N + 1):
-            x = PAD + c * CELL
-            self.canvas.create_line(x, PAD, x, PAD + N * CELL, fill="#ddd")
-        for i, v in enumerate(s):
-            if v == 0: continue
-            r, c = divmod(i, N)
-            x0, y0 = PAD + c * CELL, PAD + r * CELL
-            x1, y1 = x0 + CELL, y0 + CELL
-            self.canvas.create_rectangle(x0 + 2, y0 + 2, x1 - 2, y1 - 2,
-                                         fill="#ffffff", outline="#333", width=2)
-            self.canvas.create_text((x0 + x1) // 2, (y0 + y1) // 2,
-                                    text=str(v), font=("Arial", 16, "bold"))
+        """整盘同步（新局、重置等）；普通走子用 renderer.slide 只移动被滑动的段。"""
+        self.renderer.draw(self.board.state)
 
     # ---------------- input ----------------
+    def _now_ms(self) -> int:
+        return int(self.timer.elapsed() * 1000)
+
     def _on_click(self, e):
         if self.prestart or getattr(self, "_ui_locked", False):
             return
-        N, CELL, PAD = self.size, self.CELL, self.PAD
+        N, CELL, PAD = self.size, self.cell, self.PAD
         r = (e.y - PAD) // CELL
         c = (e.x - PAD) // CELL
         if not (0 <= r < N and 0 <= c < N):
             return
         idx = r * N + c
-        moved = self.board.segment_move_if_valid(idx)
-        if moved:
-            self.lbl_steps.config(text=f"Steps: {self.board.steps}")
-            self._draw_board()
-            if self.board.is_goal():
-                self._handle_win()
+        if self.board.segment_move_if_valid(idx, self._now_ms()):
+            self._after_move(idx)
+
+    def _after_move(self, idx: int):
+        """点击 / 撤销 / 重做 / Hint 之后：刷新步数，只移动被滑动的段，判胜或预取下一个 Hint。"""
+        self._hint_wanted = False   # 等待中的 Hint 是针对旧盘面的
+        self._show_steps()
+        self.renderer.slide(idx)
+        if self.board.is_goal():
+            self._handle_win()
+        else:
+            self._prefetch()
 
     # ---------------- actions ----------------
     def _confirm_and_start(self):
-        steps = 60 if self.size == 3 else (200 if self.size == 4 else 400)
-        self.board = Board(self.size, scramble_from_goal(self.size, steps))
+        # 优先从预生成题库取题（O(1)），库空时现场生成；取完后按需后台补库
+        picked = pop_puzzle(self.size)
+        self.board = Board(self.size, picked.state if picked else random_solvable(self.size))
+        refill_async(self.size)
         self.board.start = self.board.state[:]
         self.board.steps = 0
 
         self.timer = GameTimer()
         self.timer.start()
+        self._tick_job.wake()
 
         self.prestart = False
         self.used_hint = False      # ★ 新局清零
@@ -143,6 +158,9 @@ class GameView(ttk.Frame):
 
         self._render_bottom()
         self._draw_board()
+        self.hints.clear()
+        self.planner.clear()
+        self._prefetch()
 
     def _reset(self):
         if getattr(self, "_ui_locked", False):
@@ -150,32 +168,85 @@ class GameView(ttk.Frame):
         self.board.reset_to_start()
         self.timer = GameTimer()
         self.timer.start()
+        self._tick_job.wake()
         self.used_hint = False      # ★ 重置也清零
+        self._hint_wanted = False
         self.lbl_steps.config(text="Steps: 0")
         self._draw_board()
+        self._prefetch()
+
+    def _undo(self):
+        """撤销一步（O(段长)，日志与步数同步回退）；renderer 按新的空格位置滑回这一段。"""
+        if self.prestart or getattr(self, "_ui_locked", False):
+            return
+        if self.board.undo() is not None:
+            self._after_move(self.board.blank)
+
+    def _redo(self):
+        if self.prestart or getattr(self, "_ui_locked", False):
+            return
+        if self.board.redo(self._now_ms()) is not None:
+            self._after_move(self.board.blank)
 
     def _back_home(self):
         if getattr(self, "_ui_locked", False):
             return
         self.on_back_home()
 
-    def _hint_3x3(self):
-        if self.size != 3 or self.board.is_goal() or self.prestart or getattr(self, "_ui_locked", False):
+    def _on_destroy(self, e):
+        if e.widget is self:
+            self.hints.close()
+            hint_cache().save()     # 在 UI 线程里落盘：关窗时后台线程可能来不及写完
+
+    # ---------------- hint ----------------
+    def _prefetch(self):
+        """盘面变化后：还在计划路径上（或几步内接得回）就不必后台重算，否则预取新局面。"""
+        plan = self.hints.take_plan()
+        if plan is not None:
+            self.planner.adopt(*plan)
+        if not self.planner.follow(self.board.state):
+            self.hints.request(self.board.state)
+
+    def _show_steps(self):
+        """用过 Hint 后在步数旁显示按当前计划还剩的步数。"""
+        text = f"Steps: {self.board.steps}"
+        left = self.planner.remaining(self.board.state) if self.used_hint else None
+        if left:
+            text += f"  (~{left} to go)"
+        self.lbl_steps.config(text=text)
+
+    def _hint(self):
+        if self.board.is_goal() or self.prestart or getattr(self, "_ui_locked", False):
             return
-        try:
-            from hint.hint_3x3 import bfs_first_move_3x3
-        except Exception:
-            messagebox.showerror("Hint", "Hint module not found.")
+        if self._hint_wanted:           # 已在等待结果
+            return
+        idx = self.planner.next_move(self.board.state)
+        if idx is not MISS:             # 在计划路径上：不用等后台
+            self._apply_hint(idx)
+            return
+        self._hint_wanted = True
+        self.hints.request(self.board.state)   # 通常早已预取，这里是兜底
+        self._hint_job.wake()
+
+    def _poll_hint(self):
+        """结果未就绪时每 20ms 轮询一次；期间玩家走子会取消这次 Hint。"""
+        if not self._hint_wanted or getattr(self, "_ui_locked", False):
+            return None
+        ready, idx = self.hints.lookup(self.board.state)
+        if not ready:
+            return 20
+        self._hint_wanted = False
+        plan = self.hints.take_plan()
+        if plan is not None:
+            self.planner.adopt(*plan)
+        self._apply_hint(idx)
+        return None
+
+    def _apply_hint(self, idx):
+        if idx is None or not self.board.segment_move_if_valid(idx, self._now_ms()):
             return
-        next_state, _ = bfs_first_move_3x3(self.board.state)
-        if next_state is None: return
-        self.board.state = list(next_state)
         self.used_hint = True          # ★ 标记
-        self.board.steps += 1
-        self.lbl_steps.config(text=f"Steps: {self.board.steps}")
-        self._draw_board()
-        if self.board.is_goal():
-            self._handle_win()
+        self._after_move(idx)
 
     # ---------------- admin restore ----------------
     def _admin_restore(self):
@@ -183,7 +254,7 @@ class GameView(ttk.Frame):
         if self.prestart:  # 预览态不用
             return
         # 设置到目标状态
-        self.board.state = list(range(1, self.size*self.size)) + [0]
+        self.board.set_state(list(range(1, self.size*self.size)) + [0])
         self.board.steps += 1
         self.lbl_steps.config(text=f"Steps: {self.board.steps}")
         self._draw_board()
@@ -219,26 +290,38 @@ class GameView(ttk.Frame):
         self._win_pending = True
 
         self.timer.stop()
+        self._tick_job.wake()       # 显示最终时间，随后休眠
         t_ms = int(self.timer.elapsed() * 1000)
 
-        lb = load_lb()
-
-        if not self.used_hint and self.user != 'admin':
-            submit_record(lb, self.size, self.user, t_ms, self.board.steps)
-            save_lb(lb)
-        
-        # best_ms = best_time_ms(lb, self.size)
-        best_ms = best_time_ms_user(lb, self.size, self.user)
-
         self._lock_ui()
+        self._save_win(t_ms)
+
+    def _save_win(self, t_ms: int, attempt: int = 0):
+        """写成绩；排行榜被其他进程占用时用 after() 稍后重试，不阻塞 Tk 主循环。"""
+        store = get_store()
+        try:
+            if not self.used_hint and self.user != 'admin':
+                store.submit_record(self.size, self.user, t_ms, self.board.steps,
+                                    self.board.start, self.board.journal.to_bytes())
+        except LeaderboardBusy:
+            if attempt < 40:
+                self.after(50, lambda: self._save_win(t_ms, attempt + 1))
+                return
+            messagebox.showwarning("Leaderboard", "Leaderboard is busy; this run was not saved.")
+
+        # best_ms = store.best_time_ms(self.size)
+        best_ms = store.best_time_ms_user(self.size, self.user)
         self.after(500, lambda: self.on_success(self.size, t_ms, self.board.steps, best_ms))
 
     def _new_game_same_size(self):
         pass
 
     def _tick(self):
-        self.lbl_time.config(text=GameTimer.fmt(self.timer.elapsed()))
-        self.after(200, self._tick)
+        text = GameTimer.fmt(self.timer.elapsed())
+        if text != self._shown_time:
+            self._shown_time = text
+            self.lbl_time.config(text=text)
+        return self.timer.ms_to_next_second()
 
     # # ---------------- hint ----------------
     # def _hint_any(self):
@@ -1,5 +1,6 @@
 import tkinter as tk
 from tkinter import ttk
+from core_board import LARGE_SIZES
 
 class HomeView(ttk.Frame):
     def __init__(self, master, on_pick_size, on_open_leaderboard, on_quit, current_user: str = "player"):
@@ -18,6 +19,14 @@ class HomeView(ttk.Frame):
             ttk.Button(sizes, text=f"{n}×{n}", width=16,
                        command=lambda s=n: on_pick_size(s)).pack(pady=4)
 
+        # 大棋盘（6×6 ~ 15×15）：下拉选尺寸
+        large = ttk.Frame(sizes); large.pack(pady=(10,0))
+        self.large_size = tk.StringVar(value=f"{LARGE_SIZES[0]}×{LARGE_SIZES[0]}")
+        ttk.Combobox(large, textvariable=self.large_size, state="readonly", width=8,
+                     values=[f"{n}×{n}" for n in LARGE_SIZES]).pack(side="left", padx=(0,6))
+        ttk.Button(large, text="Large Board",
+                   command=lambda: on_pick_size(int(self.large_size.get().split("×")[0]))).pack(side="left")
+
         ttk.Button(self, text="Leaderboard", command=on_open_leaderboard).pack(pady=10)
         ttk.Button(self, text="Exit", command=on_quit).pack(pady=(16,0))
 
@@ -1,7 +1,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from io_leaderboard import load_lb, save_lb, top10, clear_level, delete_record
+from io_leaderboard import get_store, LeaderboardBusy
 from core_timer import GameTimer
+from core_board import LARGE_SIZES
 
 class LeaderboardView(ttk.Frame):
     def __init__(self, master, on_back, current_user: str):
@@ -21,6 +22,13 @@ class LeaderboardView(ttk.Frame):
         for n in (3,4,5):
             ttk.Button(pick, text=f"{n}×{n}",
                        command=lambda s=n: self._show_size(s)).pack(side="left", padx=4)
+        # 大棋盘尺寸放进下拉框（榜单在首次提交时才创建，没有记录的尺寸显示为空表）
+        self.large_pick = ttk.Combobox(pick, state="readonly", width=8,
+                                       values=[f"{n}×{n}" for n in LARGE_SIZES])
+        self.large_pick.set("More…")
+        self.large_pick.bind("<<ComboboxSelected>>",
+                             lambda _e: self._show_size(int(self.large_pick.get().split("×")[0])))
+        self.large_pick.pack(side="left", padx=4)
 
         # 表格
         self.table = ttk.Treeview(self, columns=("rank","user","time","steps","date"),
@@ -48,8 +56,7 @@ class LeaderboardView(ttk.Frame):
 
     def _show_size(self, size: int):
         self.current_size = size
-        lb = load_lb()
-        rows = top10(lb, size)
+        rows = get_store().top10(size)
 
         # 清空表格
         for i in self.table.get_children():
@@ -64,9 +71,11 @@ class LeaderboardView(ttk.Frame):
     def _on_clear_all(self):
         """清空当前尺寸排行榜"""
         if messagebox.askyesno("Confirm", f"Clear leaderboard for {self.current_size}×{self.current_size}?"):
-            lb = load_lb()
-            clear_level(lb, self.current_size)
-            save_lb(lb)
+            try:
+                get_store().clear_level(self.current_size)
+            except LeaderboardBusy:
+                messagebox.showerror("Busy", "Leaderboard is in use, please try again.")
+                return
             self._show_size(self.current_size)
             messagebox.showinfo("Cleared", f"Leaderboard for {self.current_size}×{self.current_size} cleared.")
 
@@ -83,10 +92,12 @@ class LeaderboardView(ttk.Frame):
         if not messagebox.askyesno("Confirm", "Delete selected record?"):
             return
 
-        lb = load_lb()
-        ok = delete_record(lb, self.current_size, idx_in_view)
+        try:
+            ok = get_store().delete_record(self.current_size, idx_in_view)
+        except LeaderboardBusy:
+            messagebox.showerror("Busy", "Leaderboard is in use, please try again.")
+            return
         if ok:
-            save_lb(lb)
             self._show_size(self.current_size)
             messagebox.showinfo("Deleted", "Record deleted.")
         else:
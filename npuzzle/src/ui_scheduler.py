@@ -0,0 +1,51 @@
+# 界面定时任务：由 App 持有，切换页面时统一取消，避免已销毁的页面还在被回调。
+import tkinter as tk
+from typing import Callable, Dict, List, Optional
+
+class Job:
+    """
+    一个可休眠的周期任务：fn() 返回下次运行的延迟（毫秒），返回 None 则休眠，
+    直到 wake() 再次唤醒。没有事可做时不占用任何 after 回调。
+    """
+    def __init__(self, root: tk.Misc, fn: Callable[[], Optional[int]]):
+        self.root = root
+        self.fn = fn
+        self._after: Optional[str] = None
+        self._alive = True
+
+    def wake(self):
+        """立刻（下一次空闲时）运行一次，取代已排好的下一次。"""
+        if not self._alive:
+            return
+        if self._after is not None:
+            self.root.after_cancel(self._after)
+        self._after = self.root.after_idle(self._run)
+
+    def _run(self):
+        self._after = None
+        delay = self.fn()
+        if delay is not None and self._alive:
+            self._after = self.root.after(delay, self._run)
+
+    def cancel(self):
+        self._alive = False
+        if self._after is not None:
+            self.root.after_cancel(self._after)
+            self._after = None
+
+class Scheduler:
+    """按页面（owner）登记任务；App._switch 销毁旧页面前调用 cancel(旧页面)。"""
+    def __init__(self, root: tk.Misc):
+        self.root = root
+        self._jobs: Dict[tk.Misc, List[Job]] = {}
+
+    def every(self, owner: tk.Misc, fn: Callable[[], Optional[int]]) -> Job:
+        """注册并立即运行一次；之后按 fn 的返回值自行排期。"""
+        job = Job(self.root, fn)
+        self._jobs.setdefault(owner, []).append(job)
+        job.wake()
+        return job
+
+    def cancel(self, owner: tk.Misc):
+        for job in self._jobs.pop(owner, []):
+            job.cancel()
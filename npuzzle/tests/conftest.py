@@ -0,0 +1,19 @@
+# pytest 公共设置：把 src/ 加入 sys.path（与 bench 相同）；排行榜类测试用临时数据目录。
+import os, sys
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """排行榜 JSON、历史日志、锁文件都写到 tmp_path，不碰真实 data/。"""
+    import io_history, io_leaderboard
+    monkeypatch.setattr(io_leaderboard, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(io_leaderboard, "PATH", str(tmp_path / "leaderboard.json"))
+    monkeypatch.setattr(io_history, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(io_history, "_histories", {})
+    monkeypatch.setitem(io_leaderboard._cache, "sig", None)
+    return tmp_path
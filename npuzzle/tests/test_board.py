@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from core_board import Board
+from core_journal import replay
+from core_scramble import random_solvable
+
+@pytest.mark.parametrize("N", [3, 4, 5, 8])
+def test_undo_redo_round_trip(N):
+    rnd = random.Random(N)
+    board = Board(N, random_solvable(N, seed=N))
+    history = [list(board.state)]
+    while board.steps < 200:
+        if board.segment_move_if_valid(rnd.randrange(N * N)):
+            history.append(list(board.state))
+    moves = list(board.journal.moves)
+
+    for expect in reversed(history[:-1]):
+        assert board.undo()
+        assert list(board.state) == expect
+        assert board.blank == board.state.index(0)
+    assert board.undo() is None and board.steps == 0
+    assert board.manhattan == Board(N, history[0]).manhattan
+
+    for expect in history[1:]:
+        assert board.redo()
+        assert list(board.state) == expect
+    assert board.redo() is None
+    assert list(board.journal.moves) == moves
+    assert replay(history[0], N, moves) == history[-1]
+
+def test_new_move_clears_redo():
+    board = Board(3, [1, 2, 3, 4, 5, 6, 7, 0, 8])
+    assert board.segment_move_if_valid(8)
+    assert board.is_goal()
+    board.undo()
+    assert board.segment_move_if_valid(6)
+    assert board.redo() is None
+
+def test_invalid_clicks():
+    board = Board(3, [1, 2, 3, 4, 5, 6, 7, 0, 8])
+    for k in (7, 0, 2, 9, -1):             # 空格本身、不同行列、越界
+        assert board.segment_move_if_valid(k) is None
+    assert board.steps == 0 and not board.journal.moves
+
+@pytest.mark.parametrize("N", [3, 4, 5, 15])
+def test_batch_matches_board(N):
+    np = pytest.importorskip("numpy")
+    from core_batch import BoardBatch
+    rnd = random.Random(N)
+    starts = [random_solvable(N, seed=1000 * N + i) for i in range(16)]
+    boards = [Board(N, s) for s in starts]
+    batch = BoardBatch(starts, N)
+    for _ in range(100):
+        ks = [rnd.randrange(-1, N * N + 1) for _ in boards]   # 含无效与越界点击
+        ok = batch.segment_move(np.array(ks))
+        for i, (board, k) in enumerate(zip(boards, ks)):
+            assert bool(ok[i]) == (board.segment_move_if_valid(k) is not None)
+    assert batch.states.tolist() == [list(b.state) for b in boards]
+    assert batch.blank.tolist() == [b.blank for b in boards]
+    assert batch.steps.tolist() == [b.steps for b in boards]
+    assert batch.manhattan().tolist() == [b.manhattan for b in boards]
+    assert batch.is_goal().tolist() == [b.is_goal() for b in boards]
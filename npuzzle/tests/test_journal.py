@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from core_board import Board
+from core_journal import MoveJournal, journal_moves, replay, verify_run
+from core_scramble import random_solvable
+
+def _journal(n_moves, seed=0, cells=16):
+    rnd = random.Random(seed)
+    j = MoveJournal()
+    t = 0
+    for _ in range(n_moves):
+        t += rnd.choice([0, 1, 90, 127, 128, 5_000, 300_000])
+        j.record(rnd.randrange(cells), t)
+    return j
+
+@pytest.mark.parametrize("n_moves", [0, 1, 50])
+def test_bytes_and_text_round_trip(n_moves):
+    j = _journal(n_moves, seed=n_moves)
+    for back in (MoveJournal.from_bytes(j.to_bytes()), MoveJournal.from_text(j.to_text())):
+        assert back.moves == j.moves and back.times == j.times
+    assert journal_moves(j.to_bytes(), 16) == bytes(j.moves)
+    assert journal_moves(j.to_bytes()) == bytes(j.moves)
+
+def test_truncated_blob_never_raises_index_error():
+    j = _journal(30, seed=1)
+    blob = j.to_bytes()
+    for cut in range(1, len(blob)):
+        try:
+            back = MoveJournal.from_bytes(blob[:cut])
+        except ValueError as e:
+            assert "truncated" in str(e)
+        else:                                   # 恰好切在记录边界：得到前缀
+            assert back.moves == j.moves[:len(back.moves)]
+
+def test_cut_inside_varint():
+    j = MoveJournal()
+    j.record(3, 0)
+    j.record(5, 300_000)                     # 时间差要 3 个字节
+    blob = j.to_bytes()
+    for cut in (len(blob) - 1, len(blob) - 2, 4):
+        with pytest.raises(ValueError, match="truncated"):
+            MoveJournal.from_bytes(blob[:cut])
+        with pytest.raises(ValueError):
+            journal_moves(blob[:cut], 16)
+
+def test_unknown_version():
+    with pytest.raises(ValueError):
+        MoveJournal.from_bytes(b"\x7f\x01\x00")
+    with pytest.raises(ValueError):
+        MoveJournal.from_bytes(b"")
+
+@pytest.mark.parametrize("N", [3, 4, 5])
+def test_replay_matches_board(N):
+    rnd = random.Random(N)
+    start = random_solvable(N, seed=N)
+    board = Board(N, start)
+    while board.steps < 300:
+        board.segment_move_if_valid(rnd.randrange(N * N), t_ms=board.steps * 250)
+    j = MoveJournal.from_bytes(board.journal.to_bytes())
+    assert replay(start, N, j.moves) == list(board.state)
+    assert verify_run(start, N, j, board.steps) == board.is_goal()
+    with pytest.raises(ValueError):
+        replay(start, N, [start.index(0)])     # 点空格本身是无效点击
@@ -0,0 +1,45 @@
+import pytest
+
+from core_board import Board
+from core_scramble import is_solvable, random_solvable, scramble_from_goal
+
+def _goal(N):
+    return list(range(1, N * N)) + [0]
+
+@pytest.mark.parametrize("N", [2, 3, 4, 5])
+def test_goal_and_scrambles_are_solvable(N):
+    assert is_solvable(_goal(N), N)
+    for seed in range(20):
+        assert is_solvable(scramble_from_goal(N, 50, seed=seed), N)
+
+@pytest.mark.parametrize("N", [3, 4, 5])
+def test_swapping_two_tiles_breaks_solvability(N):
+    s = _goal(N)
+    s[0], s[1] = s[1], s[0]
+    assert not is_solvable(s, N)
+    with pytest.raises(ValueError):
+        Board(N, s)
+
+@pytest.mark.parametrize("state", [[1, 2, 3], [1, 1, 2, 3, 4, 5, 6, 7, 0], [1, 2, 3, 4, 5, 6, 7, 8, 9]])
+def test_malformed_boards(state):
+    assert not is_solvable(state, 3)
+
+@pytest.mark.parametrize("N", [2, 3, 4, 6, 15])
+def test_random_solvable(N):
+    seen = set()
+    for seed in range(50):
+        s = random_solvable(N, seed=seed)
+        assert sorted(s) == list(range(N * N))
+        assert is_solvable(s, N) and s != _goal(N)
+        assert random_solvable(N, seed=seed) == s     # 同一 seed 结果不变
+        seen.add(tuple(s))
+    assert len(seen) > (5 if N == 2 else 45)
+
+def test_random_solvable_is_uniform_on_2x2():
+    # 2×2 只有 12 个可解局面，去掉目标后每个应约占 1/11
+    counts = {}
+    for seed in range(5500):
+        s = tuple(random_solvable(2, seed=seed))
+        counts[s] = counts.get(s, 0) + 1
+    assert len(counts) == 11
+    assert min(counts.values()) > 400 and max(counts.values()) < 600
@@ -0,0 +1,53 @@
+import threading
+
+import pytest
+
+from core_journal import replay
+from core_scramble import random_solvable
+from hint import hint_pdb
+from hint.hint_3x3 import bfs_solve_3x3, load_distance_table_3x3, table_solve_3x3
+from hint.hint_ida import ida_star, segment_lower_bound
+from hint.hint_reduce import reduce_first_move, reduce_solve
+
+def _goal(N):
+    return list(range(1, N * N)) + [0]
+
+def _optimal_3x3(s):
+    """参照解：有距离表就沿表下降，没有就整图 BFS。"""
+    moves = table_solve_3x3(s) if load_distance_table_3x3() is not None else None
+    return moves if moves is not None else bfs_solve_3x3(s)[0]
+
+@pytest.mark.parametrize("use_pdb", [False, True])
+def test_ida_is_optimal_on_3x3(use_pdb, monkeypatch):
+    if not use_pdb:
+        monkeypatch.setitem(hint_pdb._loaded, 3, None)
+    elif hint_pdb.load_pdb(3) is None:
+        pytest.skip("no 3x3 pattern database (python -m hint.hint_pdb 3)")
+    for seed in range(12):
+        s = random_solvable(3, seed=seed)
+        ref = _optimal_3x3(s)
+        res = ida_star(s, 3, max_nodes=10**7, time_limit=60)
+        assert res.moves is not None
+        assert len(res.moves) == len(ref)
+        assert segment_lower_bound(s, 3) <= len(ref)
+        assert replay(s, 3, res.moves) == _goal(3)
+
+def test_ida_max_cost_prunes():
+    s = random_solvable(3, seed=3)
+    d = len(_optimal_3x3(s))
+    res = ida_star(s, 3, max_nodes=10**7, time_limit=60, max_cost=d - 1)
+    assert res.moves is None and res.bound > d - 1
+
+@pytest.mark.parametrize("N", range(4, 16))
+def test_reduce_solve_reaches_goal(N):
+    for seed in range(3 if N <= 8 else 1):
+        s = random_solvable(N, seed=seed)
+        moves = reduce_solve(s, N)
+        assert replay(s, N, moves) == _goal(N)          # 无效点击会抛 ValueError
+        assert reduce_first_move(s, N) == moves[0]
+    assert reduce_solve(_goal(N), N) == []
+
+def test_reduce_solve_cancel():
+    cancel = threading.Event()
+    cancel.set()
+    assert reduce_solve(random_solvable(6, seed=0), 6, cancel) is None
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+def _key(rows):
+    return [(r["user"], r["time_ms"], r["steps"]) for r in rows]
+
+@pytest.fixture
+def stores(data_dir):
+    from io_lb_sqlite import SqliteStore
+    from io_leaderboard import JsonStore
+    sq = SqliteStore(str(data_dir / "lb.sqlite3"), str(data_dir / "absent.json"))
+    yield JsonStore(), sq
+    sq.close()
+
+def _fill(stores, count=25, seed=0):
+    rnd = random.Random(seed)
+    times = rnd.sample(range(5_000, 200_000), 2 * count)     # 时间互不相同，排序无并列
+    for i in range(count):
+        for size, t in ((3, times[2 * i]), (4, times[2 * i + 1])):
+            user, steps = f"u{rnd.randrange(5)}", rnd.randrange(10, 300)
+            for st in stores:
+                st.submit_record(size, user, t, steps)
+
+def _assert_agree(js, sq):
+    for size in (3, 4):
+        assert _key(js.top10(size)) == _key(sq.top10(size))
+        assert js.best_time_ms(size) == sq.best_time_ms(size)
+        for user in ("u0", "u1", "u2", "u3", "u4", "nobody", ""):
+            assert js.best_time_ms_user(size, user) == sq.best_time_ms_user(size, user)
+            assert _key(js.user_history(size, user)) == _key(sq.user_history(size, user))
+        for t in (0, 50_000, 100_000, 10**9):
+            assert js.rank_of(size, t) == sq.rank_of(size, t)
+        for q in (0.0, 0.25, 0.5, 0.9, 1.0):
+            assert js.percentile(size, q) == sq.percentile(size, q)
+
+def test_stores_agree(stores):
+    _fill(stores)
+    js, sq = stores
+    assert len(js.top10(3)) == 10
+    _assert_agree(js, sq)
+
+def test_delete_promotes_next_run(stores):
+    _fill(stores)
+    js, sq = stores
+    eleventh = None
+    for idx in (0, 4, 9):
+        before = _key(sq.top10(3))
+        assert js.delete_record(3, idx) and sq.delete_record(3, idx)
+        after = _key(js.top10(3))
+        assert len(after) == 10
+        assert after == before[:idx] + before[idx + 1:] + [after[-1]]     # 第 11 名补上来
+        assert after[-1] != eleventh
+        eleventh = after[-1]
+        _assert_agree(js, sq)
+    assert not js.delete_record(3, 10) and not sq.delete_record(3, 10)
+    assert not js.delete_record(3, -1) and not sq.delete_record(3, -1)
+
+def test_clear(stores):
+    _fill(stores, count=8)
+    js, sq = stores
+    js.clear_level(3)
+    sq.clear_level(3)
+    assert js.top10(3) == sq.top10(3) == []
+    assert js.percentile(3, 0.5) is None and sq.percentile(3, 0.5) is None
+    _assert_agree(js, sq)
+    js.clear_all()
+    sq.clear_all()
+    _assert_agree(js, sq)
+    assert js.top10(4) == []
+    _fill(stores, count=3, seed=1)                  # 清空后还能继续写
+    _assert_agree(js, sq)